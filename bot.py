@@ -1,17 +1,21 @@
 """Main bot file for Event Organizer Bot."""
 import asyncio
 import logging
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 import pytz
 from aiogram import Bot, Dispatcher
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.enums import ParseMode
 
 import config
 from database import db
 from google_sheets import sheets_manager
 from scheduler import ReminderScheduler
+from middlewares import UserContextMiddleware
 from handlers import start, events, admin
 
 
@@ -36,9 +40,14 @@ handler.setFormatter(TashkentFormatter(
     fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 ))
+
+# Loggers only enqueue records; the stream is written from a background thread
+# so stdout flushes never stall the event loop or Google Sheets calls
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, handler)
 logging.basicConfig(
     level=logging.INFO,
-    handlers=[handler]
+    handlers=[QueueHandler(log_queue)]
 )
 logger = logging.getLogger(__name__)
 
@@ -46,6 +55,10 @@ logger = logging.getLogger(__name__)
 logging.getLogger('apscheduler.executors.default').setLevel(logging.WARNING)
 logging.getLogger('apscheduler.scheduler').setLevel(logging.WARNING)
 
+# Connections to the Bot API the shared session may keep open at once, so
+# bursts of button presses reuse open TLS connections instead of queueing
+TELEGRAM_CONNECTION_LIMIT = 200
+
 # Global scheduler instance (needed in events.py)
 reminder_scheduler = None
 
@@ -58,30 +71,27 @@ async def on_startup(bot: Bot):
     await db.init_db()
     logger.info("Database initialized")
 
-    # Initialize Google Sheets
-    try:
-        sheets_manager.initialize()
-        if sheets_manager.is_connected():
-            logger.info("Google Sheets connected successfully")
-        else:
-            logger.warning("Google Sheets not configured or connection failed")
-    except Exception as e:
-        logger.error(f"Error initializing Google Sheets: {e}")
+    # Initialize Google Sheets in the background; sheet writes made meanwhile
+    # are queued and applied once it is connected
+    sheets_manager.start_initialize()
 
     # Start reminder scheduler
     global reminder_scheduler
     reminder_scheduler = ReminderScheduler(bot)
+    await reminder_scheduler.load_reminders()
     reminder_scheduler.start()
 
     # Set scheduler in events handler module
-    from handlers import events as events_handler
-    events_handler.reminder_scheduler = reminder_scheduler
+    events.reminder_scheduler = reminder_scheduler
 
     # Mark past events in Google Sheets with gray background
+    # (runs right after the background connection is ready)
     if sheets_manager.is_connected():
         try:
-            sheets_manager.mark_past_events()
-            logger.info("Marked past events in Google Sheets")
+            await sheets_manager.mark_past_events(
+                await db.get_past_event_ids(), await db.get_event_ids()
+            )
+            logger.info("Requested marking past events in Google Sheets")
         except Exception as e:
             logger.error(f"Error marking past events: {e}")
 
@@ -96,19 +106,32 @@ async def on_shutdown():
     if reminder_scheduler:
         reminder_scheduler.stop()
 
+    # Apply Google Sheets writes still waiting in the background queue
+    await sheets_manager.drain()
+
+    # Close the shared database connection
+    await db.close()
+
     logger.info("Bot shutdown complete!")
 
 
 async def main():
     """Main function to run the bot."""
     # Initialize bot and dispatcher
+    session = AiohttpSession(limit=TELEGRAM_CONNECTION_LIMIT)
     bot = Bot(
         token=config.BOT_TOKEN,
+        session=session,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
 
     dp = Dispatcher(storage=MemoryStorage())
 
+    # Resolve admin/registration status once per update for all handlers
+    user_context = UserContextMiddleware()
+    dp.message.outer_middleware(user_context)
+    dp.callback_query.outer_middleware(user_context)
+
     # Register routers
     dp.include_router(start.router)
     dp.include_router(events.router)
@@ -127,7 +150,10 @@ async def main():
 
 
 if __name__ == '__main__':
+    log_listener.start()
     try:
         asyncio.run(main())
     except (KeyboardInterrupt, SystemExit):
         logger.info("Bot stopped by user")
+    finally:
+        log_listener.stop()
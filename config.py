@@ -15,14 +15,14 @@ if not BOT_TOKEN:
 GOOGLE_SHEETS_CREDENTIALS_FILE = os.getenv('GOOGLE_SHEETS_CREDENTIALS_FILE', 'credentials.json')
 GOOGLE_SPREADSHEET_ID = os.getenv('GOOGLE_SPREADSHEET_ID')
 
-# Admin Configuration
-ADMIN_USER_IDS = [
+# Admin Configuration (frozenset: checked on every update)
+ADMIN_USER_IDS = frozenset(
     int(user_id.strip())
     for user_id in os.getenv('ADMIN_USER_IDS', '').split(',')
     if user_id.strip().isdigit()
-]
-# config.py
-ALLOWED_USER_IDS = [
+)
+# Users allowed to use the bot (frozenset for O(1) membership checks)
+ALLOWED_USER_IDS = frozenset([
     632450666,
     1194431231,
     1457627,
@@ -68,7 +68,7 @@ ALLOWED_USER_IDS = [
     323474264,
     1375907081
 
-    ]
+    ])
 
 # Media group chat ID (convert to int)
 MEDIA_GROUP_CHAT_ID_STR = os.getenv('MEDIA_GROUP_CHAT_ID', '')
@@ -1,10 +1,70 @@
 """Database module for the Event Organizer Bot."""
 import aiosqlite
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import date as date_type, datetime
+from typing import Optional, List, Dict, Any, Set, Tuple, Union
 import config
 import pytz
 
+logger = logging.getLogger(__name__)
+
+# Local timezone, resolved once
+_TZ = pytz.timezone(config.TIMEZONE)
+
+# How long a database answer to is_admin() is reused (seconds)
+ADMIN_CACHE_TTL = 60
+
+# RETURNING list giving the same columns as get_event(): the event row plus
+# its creator's details (RETURNING cannot join, so they are subqueries)
+_EVENT_RETURNING = '''*,
+    (SELECT full_name FROM users WHERE telegram_id = created_by_user_id) AS creator_name,
+    (SELECT department FROM users WHERE telegram_id = created_by_user_id) AS creator_department,
+    (SELECT phone FROM users WHERE telegram_id = created_by_user_id) AS creator_phone'''
+
+# Events that start after now: a later day, or today with a later
+# zero-padded HH:MM time (parameters from _upcoming_params())
+_UPCOMING_SQL = '(e.event_date > ? OR (e.event_date = ? AND e.time > ?))'
+
+# Event columns that update_event() may change
+_EDITABLE_EVENT_FIELDS = ('title', 'date', 'time', 'place', 'comment')
+
+
+def _iso_date(value: Union[str, date_type]) -> str:
+    """
+    Convert a date or a DD.MM.YYYY string to the YYYY-MM-DD form of events.event_date.
+
+    Raises:
+        ValueError: If the string is not a valid DD.MM.YYYY date
+    """
+    if isinstance(value, date_type):
+        return value.isoformat()
+    return datetime.strptime(value, '%d.%m.%Y').date().isoformat()
+
+
+def _upcoming_params() -> Tuple[str, str, str]:
+    """Current local date and time as the parameters of _UPCOMING_SQL."""
+    now = datetime.now(_TZ)
+    today = now.date().isoformat()
+    return today, today, now.strftime('%H:%M')
+
+
+def _event_date_column(date: str) -> Optional[str]:
+    """Value stored in events.event_date for an event's DD.MM.YYYY date (None if unparseable)."""
+    try:
+        return _iso_date(date)
+    except (TypeError, ValueError):
+        return None
+
+
+# How long statistics results are reused (seconds); event writes clear them
+STATS_CACHE_TTL = 15
+
+# How long get_event() results are reused (seconds); event writes drop them
+EVENT_CACHE_TTL = 30
+
 
 class Database:
     """Database handler for SQLite operations."""
@@ -12,6 +72,46 @@ class Database:
     def __init__(self, db_path: str = config.DATABASE_PATH):
         """Initialize database connection."""
         self.db_path = db_path
+        # telegram_id -> (expires_at, is_admin) for the database part of is_admin()
+        self._admin_cache: Dict[int, Tuple[float, bool]] = {}
+        # telegram_id -> (expires_at, context) for get_user_context()
+        self._user_ctx_cache: Dict[int, Tuple[float, Dict[str, bool]]] = {}
+        # event id -> (expires_at, event) for get_event()
+        self._event_cache: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        # statistic name -> (expires_at, result)
+        self._stats_cache: Dict[str, Tuple[float, Any]] = {}
+        # Active departments as returned by get_all_departments(); None = not loaded
+        self._dept_cache: Optional[List[Dict[str, Any]]] = None
+        # One connection shared by all queries (opened on first use) and the
+        # lock that gives each query block exclusive use of it
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @asynccontextmanager
+    async def _connect(self):
+        """
+        Use the shared connection, opening it on first use.
+
+        Blocks run one at a time, and anything a block leaves uncommitted is
+        rolled back, as closing a per-call connection used to do.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._conn is None:
+                self._conn = await aiosqlite.connect(self.db_path)
+                self._conn.row_factory = aiosqlite.Row
+            try:
+                yield self._conn
+            finally:
+                if self._conn.in_transaction:
+                    await self._conn.rollback()
+
+    async def close(self):
+        """Close the shared connection (reopened if used again)."""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
 
     def _convert_utc_to_local(self, utc_timestamp_str: str) -> str:
         """Convert UTC timestamp string to local timezone."""
@@ -21,18 +121,17 @@ class Database:
             utc_dt = pytz.utc.localize(utc_dt)
 
             # Convert to local timezone
-            local_tz = pytz.timezone(config.TIMEZONE)
-            local_dt = utc_dt.astimezone(local_tz)
+            local_dt = utc_dt.astimezone(_TZ)
 
             # Return formatted string
             return local_dt.strftime('%Y-%m-%d %H:%M:%S')
         except Exception as e:
-            print(f"Error converting timestamp: {e}")
+            logger.error("Error converting timestamp: %s", e)
             return utc_timestamp_str
 
     async def init_db(self):
         """Initialize database tables."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             # Users table
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS users (
@@ -57,10 +156,28 @@ class Database:
                     created_by_user_id INTEGER NOT NULL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     is_cancelled INTEGER DEFAULT 0,
+                    event_date TEXT,
                     FOREIGN KEY (created_by_user_id) REFERENCES users(telegram_id)
                 )
             ''')
 
+            # event_date (YYYY-MM-DD copy of the DD.MM.YYYY date) sorts and
+            # compares chronologically, so date lookups use its index;
+            # databases created before it existed get it added and backfilled
+            async with db.execute('PRAGMA table_info(events)') as cursor:
+                event_columns = {row[1] for row in await cursor.fetchall()}
+            if 'event_date' not in event_columns:
+                await db.execute('ALTER TABLE events ADD COLUMN event_date TEXT')
+                await db.execute(
+                    '''UPDATE events
+                       SET event_date = substr(date, 7, 4) || '-' || substr(date, 4, 2) || '-' || substr(date, 1, 2)'''
+                )
+            await db.execute('CREATE INDEX IF NOT EXISTS idx_events_event_date ON events (event_date)')
+            # "My events" lists filter by creator, ordered like the date views
+            await db.execute(
+                'CREATE INDEX IF NOT EXISTS idx_events_creator ON events (created_by_user_id, event_date, time)'
+            )
+
             # Reminders table (to track sent reminders)
             await db.execute('''
                 CREATE TABLE IF NOT EXISTS reminders (
@@ -71,6 +188,20 @@ class Database:
                     FOREIGN KEY (event_id) REFERENCES events(id)
                 )
             ''')
+            # One row per sent reminder, so try_claim_reminder can INSERT OR IGNORE;
+            # duplicates recorded before the index existed are dropped first
+            async with db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_reminders_event_type'"
+            ) as cursor:
+                has_reminder_index = await cursor.fetchone() is not None
+            if not has_reminder_index:
+                await db.execute(
+                    '''DELETE FROM reminders WHERE id NOT IN
+                       (SELECT MIN(id) FROM reminders GROUP BY event_id, reminder_type)'''
+                )
+                await db.execute(
+                    'CREATE UNIQUE INDEX idx_reminders_event_type ON reminders (event_id, reminder_type)'
+                )
 
             # Departments table (for admin management)
             await db.execute('''
@@ -99,21 +230,23 @@ class Database:
     async def add_user(self, telegram_id: int, full_name: str, department: str, phone: str) -> bool:
         """Add a new user to the database."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connect() as db:
                 is_admin = 1 if telegram_id in config.ADMIN_USER_IDS else 0
                 await db.execute(
                     'INSERT INTO users (telegram_id, full_name, department, phone, is_admin) VALUES (?, ?, ?, ?, ?)',
                     (telegram_id, full_name, department, phone, is_admin)
                 )
                 await db.commit()
+                self._admin_cache.pop(telegram_id, None)
+                self._user_ctx_cache.pop(telegram_id, None)
                 return True
         except Exception as e:
-            print(f"Error adding user: {e}")
+            logger.error("Error adding user: %s", e)
             return False
 
     async def get_user(self, telegram_id: int) -> Optional[Dict[str, Any]]:
         """Get user by telegram_id."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 'SELECT * FROM users WHERE telegram_id = ?',
@@ -132,9 +265,43 @@ class Database:
         # First check config.ADMIN_USER_IDS (source of truth)
         if telegram_id in config.ADMIN_USER_IDS:
             return True
-        # Fallback to database check
+        # Fallback to database check, reused for ADMIN_CACHE_TTL seconds
+        cached = self._admin_cache.get(telegram_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
         user = await self.get_user(telegram_id)
-        return user and user['is_admin'] == 1
+        result = bool(user and user['is_admin'] == 1)
+        self._admin_cache[telegram_id] = (time.monotonic() + ADMIN_CACHE_TTL, result)
+        return result
+
+    async def get_user_context(self, telegram_id: int) -> Dict[str, bool]:
+        """
+        Get a user's admin and registration status with one query.
+
+        Results are reused for ADMIN_CACHE_TTL seconds (add_user() drops the
+        entry); the returned dict is shared and must not be modified.
+
+        Returns:
+            {'is_admin': bool, 'is_registered': bool}
+        """
+        cached = self._user_ctx_cache.get(telegram_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        async with self._connect() as db:
+            async with db.execute(
+                'SELECT is_admin FROM users WHERE telegram_id = ?',
+                (telegram_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+
+        context = {
+            'is_admin': telegram_id in config.ADMIN_USER_IDS or bool(row and row[0] == 1),
+            'is_registered': row is not None,
+        }
+        self._user_ctx_cache[telegram_id] = (time.monotonic() + ADMIN_CACHE_TTL, context)
+        return context
 
     # Event CRUD operations
     async def add_event(self, title: str, date: str, time: str, place: str,
@@ -142,24 +309,62 @@ class Database:
         """Add a new event to the database."""
         try:
             # Get current time in Tashkent timezone
-            local_tz = pytz.timezone(config.TIMEZONE)
-            local_now = datetime.now(local_tz).strftime('%Y-%m-%d %H:%M:%S')
+            local_now = datetime.now(_TZ).strftime('%Y-%m-%d %H:%M:%S')
 
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connect() as db:
                 cursor = await db.execute(
-                    '''INSERT INTO events (title, date, time, place, comment, created_by_user_id, created_at)
-                       VALUES (?, ?, ?, ?, ?, ?, ?)''',
-                    (title, date, time, place, comment, created_by_user_id, local_now)
+                    '''INSERT INTO events (title, date, time, place, comment, created_by_user_id, created_at, event_date)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                    (title, date, time, place, comment, created_by_user_id, local_now,
+                     _event_date_column(date))
                 )
                 await db.commit()
+                self._stats_cache.clear()
                 return cursor.lastrowid
         except Exception as e:
-            print(f"Error adding event: {e}")
+            logger.error("Error adding event: %s", e)
+            return None
+
+    async def add_event_returning(self, title: str, date: str, time: str, place: str,
+                                  comment: str, created_by_user_id: int,
+                                  event_date: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Add a new event and return it as get_event() would, in one query.
+
+        Args:
+            event_date: The date in YYYY-MM-DD form if the caller already
+                parsed it; derived from ``date`` otherwise
+
+        Returns:
+            Event dictionary with creator info, or None on failure
+        """
+        try:
+            local_now = datetime.now(_TZ).strftime('%Y-%m-%d %H:%M:%S')
+
+            async with self._connect() as db:
+                db.row_factory = aiosqlite.Row
+                async with db.execute(
+                    f'''INSERT INTO events (title, date, time, place, comment, created_by_user_id, created_at, event_date)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        RETURNING {_EVENT_RETURNING}''',
+                    (title, date, time, place, comment, created_by_user_id, local_now,
+                     event_date or _event_date_column(date))
+                ) as cursor:
+                    row = await cursor.fetchone()
+                await db.commit()
+                self._stats_cache.clear()
+                return dict(row) if row else None
+        except Exception as e:
+            logger.error("Error adding event: %s", e)
             return None
 
     async def get_event(self, event_id: int) -> Optional[Dict[str, Any]]:
-        """Get event by ID."""
-        async with aiosqlite.connect(self.db_path) as db:
+        """Get event by ID (reused for EVENT_CACHE_TTL seconds; event writes drop it)."""
+        cached = self._event_cache.get(event_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1])
+
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 '''SELECT e.*, u.full_name as creator_name, u.department as creator_department, u.phone as creator_phone
@@ -169,38 +374,46 @@ class Database:
                 (event_id,)
             ) as cursor:
                 row = await cursor.fetchone()
-                return dict(row) if row else None
+
+        if row is None:
+            return None
+        event = dict(row)
+        self._event_cache[event_id] = (time.monotonic() + EVENT_CACHE_TTL, event)
+        return dict(event)
 
     async def get_upcoming_events(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get all upcoming events (not cancelled, date >= today)."""
-        async with aiosqlite.connect(self.db_path) as db:
+        """Get all upcoming events (not cancelled, starting after now)."""
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
-            today = datetime.now().strftime('%d.%m.%Y')
-
-            query = '''SELECT e.*, u.full_name as creator_name, u.department as creator_department, u.phone as creator_phone
+            query = f'''SELECT e.*, u.full_name as creator_name, u.department as creator_department, u.phone as creator_phone
                       FROM events e
                       JOIN users u ON e.created_by_user_id = u.telegram_id
-                      WHERE e.is_cancelled = 0
-                      ORDER BY e.date, e.time'''
+                      WHERE e.is_cancelled = 0 AND {_UPCOMING_SQL}
+                      ORDER BY e.event_date, e.time'''
 
             if limit:
                 query += f' LIMIT {limit}'
 
-            async with db.execute(query) as cursor:
+            async with db.execute(query, _upcoming_params()) as cursor:
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
 
-    async def get_events_by_date(self, date: str) -> List[Dict[str, Any]]:
-        """Get events by specific date."""
-        async with aiosqlite.connect(self.db_path) as db:
+    async def get_events_by_date(self, date: Union[str, date_type]) -> List[Dict[str, Any]]:
+        """Get events by specific date (a date or a DD.MM.YYYY string)."""
+        try:
+            event_date = _iso_date(date)
+        except ValueError:
+            return []
+
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 '''SELECT e.*, u.full_name as creator_name, u.department as creator_department, u.phone as creator_phone
                    FROM events e
                    JOIN users u ON e.created_by_user_id = u.telegram_id
-                   WHERE e.date = ? AND e.is_cancelled = 0
+                   WHERE e.event_date = ? AND e.is_cancelled = 0
                    ORDER BY e.time''',
-                (date,)
+                (event_date,)
             ) as cursor:
                 rows = await cursor.fetchall()
                 return [dict(row) for row in rows]
@@ -217,101 +430,92 @@ class Database:
         Returns:
             List of event dictionaries
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute(
-                '''SELECT e.*, u.full_name as creator_name, u.department as creator_department, u.phone as creator_phone
+        query = '''SELECT e.*, u.full_name as creator_name, u.department as creator_department, u.phone as creator_phone
                    FROM events e
                    JOIN users u ON e.created_by_user_id = u.telegram_id
-                   WHERE e.created_by_user_id = ? AND e.is_cancelled = 0
-                   ORDER BY e.date, e.time''',
-                (telegram_id,)
-            ) as cursor:
+                   WHERE e.created_by_user_id = ? AND e.is_cancelled = 0'''
+        params: List[Any] = [telegram_id]
+
+        if upcoming_only:
+            query += f' AND {_UPCOMING_SQL}'
+            params += _upcoming_params()
+
+        query += ' ORDER BY e.event_date, e.time'
+
+        async with self._connect() as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
-                events = [dict(row) for row in rows]
-
-                # Filter upcoming events if requested
-                if upcoming_only:
-                    import pytz
-                    local_tz = pytz.timezone(config.TIMEZONE)
-                    now = datetime.now(local_tz)
-
-                    upcoming_events = []
-                    for event in events:
-                        try:
-                            # Parse event datetime
-                            day, month, year = map(int, event['date'].split('.'))
-                            hour, minute = map(int, event['time'].split(':'))
-                            event_datetime = local_tz.localize(datetime(year, month, day, hour, minute))
-
-                            # Include only if event time > now
-                            if event_datetime > now:
-                                upcoming_events.append(event)
-                        except Exception as e:
-                            print(f"Error parsing event datetime: {e}")
-                            continue
-
-                    return upcoming_events
-
-                return events
-
-    async def get_events_by_date_range(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+                return [dict(row) for row in rows]
+
+    async def get_events_by_date_range(self, start_date: Union[str, date_type],
+                                       end_date: Union[str, date_type]) -> List[Dict[str, Any]]:
         """
         Get events within a date range (inclusive).
 
         Args:
-            start_date: Start date in DD.MM.YYYY format
-            end_date: End date in DD.MM.YYYY format
+            start_date: Start date (a date or DD.MM.YYYY string)
+            end_date: End date (a date or DD.MM.YYYY string)
 
         Returns:
             List of event dictionaries sorted by date and time
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        try:
+            start, end = _iso_date(start_date), _iso_date(end_date)
+        except ValueError as e:
+            logger.error("Error filtering events by date range: %s", e)
+            return []
+
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 '''SELECT e.*, u.full_name as creator_name, u.department as creator_department, u.phone as creator_phone
                    FROM events e
                    JOIN users u ON e.created_by_user_id = u.telegram_id
-                   WHERE e.is_cancelled = 0
-                   ORDER BY e.date, e.time'''
+                   WHERE e.event_date BETWEEN ? AND ? AND e.is_cancelled = 0
+                   ORDER BY e.event_date, e.time''',
+                (start, end)
             ) as cursor:
                 rows = await cursor.fetchall()
-                events = [dict(row) for row in rows]
-
-                # Filter by date range
-                try:
-                    # Parse start and end dates
-                    start_day, start_month, start_year = map(int, start_date.split('.'))
-                    start_dt = datetime(start_year, start_month, start_day)
-
-                    end_day, end_month, end_year = map(int, end_date.split('.'))
-                    end_dt = datetime(end_year, end_month, end_day, 23, 59, 59)
+                return [dict(row) for row in rows]
 
-                    filtered_events = []
-                    for event in events:
-                        day, month, year = map(int, event['date'].split('.'))
-                        event_dt = datetime(year, month, day)
+    async def get_past_event_ids(self) -> Set[int]:
+        """
+        Get IDs of all events (including cancelled) whose start time has passed.
 
-                        # Include if within range
-                        if start_dt <= event_dt <= end_dt:
-                            filtered_events.append(event)
+        Compared against the current local time on event_date and the
+        zero-padded HH:MM time.
+        """
+        now = datetime.now(_TZ)
+        today, now_time = now.date().isoformat(), now.strftime('%H:%M')
+        async with self._connect() as db:
+            async with db.execute(
+                '''SELECT id FROM events
+                   WHERE event_date < ? OR (event_date = ? AND time < ?)''',
+                (today, today, now_time)
+            ) as cursor:
+                return {row[0] for row in await cursor.fetchall()}
 
-                    return filtered_events
-                except Exception as e:
-                    print(f"Error filtering events by date range: {e}")
-                    return []
+    async def get_event_ids(self) -> Set[int]:
+        """Get IDs of all events in the database (including cancelled)."""
+        async with self._connect() as db:
+            async with db.execute('SELECT id FROM events') as cursor:
+                return {row[0] for row in await cursor.fetchall()}
 
     async def update_event(self, event_id: int, **kwargs) -> bool:
         """Update event fields and clear old reminders."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connect() as db:
                 # Build update query dynamically
                 fields = []
                 values = []
                 for key, value in kwargs.items():
-                    if key in ['title', 'date', 'time', 'place', 'comment']:
+                    if key in _EDITABLE_EVENT_FIELDS:
                         fields.append(f"{key} = ?")
                         values.append(value)
+                        if key == 'date':
+                            fields.append("event_date = ?")
+                            values.append(_event_date_column(value))
 
                 if not fields:
                     return False
@@ -326,41 +530,91 @@ class Database:
                 await db.execute("DELETE FROM reminders WHERE event_id = ?", (event_id,))
                 await db.commit()
 
+                self._stats_cache.clear()
+                self._event_cache.pop(event_id, None)
                 return True
         except Exception as e:
-            print(f"Error updating event: {e}")
+            logger.error("Error updating event: %s", e)
             return False
 
+    async def update_event_returning(self, event_id: int, **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Update event fields, clear old reminders and return the updated event.
+
+        The update and the read-back are one UPDATE ... RETURNING query.
+
+        Returns:
+            Updated event dictionary with creator info (as get_event()), or
+            None if no valid field was given, the event does not exist, or
+            the update failed
+        """
+        fields = [key for key in kwargs if key in _EDITABLE_EVENT_FIELDS]
+        if not fields:
+            return None
+        values = [kwargs[key] for key in fields]
+        if 'date' in kwargs:
+            fields.append('event_date')
+            values.append(_event_date_column(kwargs['date']))
+
+        try:
+            async with self._connect() as db:
+                db.row_factory = aiosqlite.Row
+                async with db.execute(
+                    f'''UPDATE events SET {', '.join(f"{key} = ?" for key in fields)}
+                        WHERE id = ?
+                        RETURNING {_EVENT_RETURNING}''',
+                    values + [event_id]
+                ) as cursor:
+                    row = await cursor.fetchone()
+
+                if row is None:
+                    return None
+
+                # Clear old reminders for this event
+                await db.execute("DELETE FROM reminders WHERE event_id = ?", (event_id,))
+                await db.commit()
+
+                self._stats_cache.clear()
+                self._event_cache.pop(event_id, None)
+                return dict(row)
+        except Exception as e:
+            logger.error("Error updating event: %s", e)
+            return None
+
     async def cancel_event(self, event_id: int) -> bool:
         """Cancel an event (soft delete)."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connect() as db:
                 await db.execute(
                     'UPDATE events SET is_cancelled = 1 WHERE id = ?',
                     (event_id,)
                 )
                 await db.commit()
+                self._stats_cache.clear()
+                self._event_cache.pop(event_id, None)
                 return True
         except Exception as e:
-            print(f"Error cancelling event: {e}")
+            logger.error("Error cancelling event: %s", e)
             return False
 
     async def delete_event(self, event_id: int) -> bool:
         """Permanently delete an event."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connect() as db:
                 await db.execute('DELETE FROM events WHERE id = ?', (event_id,))
                 await db.commit()
+                self._stats_cache.clear()
+                self._event_cache.pop(event_id, None)
                 return True
         except Exception as e:
-            print(f"Error deleting event: {e}")
+            logger.error("Error deleting event: %s", e)
             return False
 
     # Reminder operations
     async def add_reminder(self, event_id: int, reminder_type: str) -> bool:
         """Record that a reminder has been sent."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connect() as db:
                 await db.execute(
                     'INSERT INTO reminders (event_id, reminder_type) VALUES (?, ?)',
                     (event_id, reminder_type)
@@ -368,12 +622,45 @@ class Database:
                 await db.commit()
                 return True
         except Exception as e:
-            print(f"Error adding reminder: {e}")
+            logger.error("Error adding reminder: %s", e)
+            return False
+
+    async def try_claim_reminder(self, event_id: int, reminder_type: str) -> bool:
+        """
+        Record a reminder as sent unless it already is.
+
+        Returns True only for the caller that inserted the row, which then
+        sends the reminder; False if it was already recorded or on error.
+        """
+        try:
+            async with self._connect() as db:
+                cursor = await db.execute(
+                    'INSERT OR IGNORE INTO reminders (event_id, reminder_type) VALUES (?, ?)',
+                    (event_id, reminder_type)
+                )
+                await db.commit()
+                return cursor.rowcount == 1
+        except Exception as e:
+            logger.error("Error claiming reminder: %s", e)
+            return False
+
+    async def release_reminder(self, event_id: int, reminder_type: str) -> bool:
+        """Forget a claimed reminder whose sending failed, so it can be claimed again."""
+        try:
+            async with self._connect() as db:
+                await db.execute(
+                    'DELETE FROM reminders WHERE event_id = ? AND reminder_type = ?',
+                    (event_id, reminder_type)
+                )
+                await db.commit()
+                return True
+        except Exception as e:
+            logger.error("Error releasing reminder: %s", e)
             return False
 
     async def is_reminder_sent(self, event_id: int, reminder_type: str) -> bool:
         """Check if a reminder has been sent for an event."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             async with db.execute(
                 'SELECT id FROM reminders WHERE event_id = ? AND reminder_type = ?',
                 (event_id, reminder_type)
@@ -381,10 +668,27 @@ class Database:
                 row = await cursor.fetchone()
                 return row is not None
 
+    async def get_sent_reminders(self) -> Set[Tuple[int, str]]:
+        """Get every (event_id, reminder_type) pair recorded as sent."""
+        async with self._connect() as db:
+            async with db.execute('SELECT event_id, reminder_type FROM reminders') as cursor:
+                return {(row[0], row[1]) for row in await cursor.fetchall()}
+
     # Statistics
+    def _cached_stat(self, name: str) -> Optional[Any]:
+        """Return a statistics result cached less than STATS_CACHE_TTL ago."""
+        cached = self._stats_cache.get(name)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        return None
+
     async def get_event_count_by_department(self) -> List[Dict[str, Any]]:
         """Get event count grouped by department."""
-        async with aiosqlite.connect(self.db_path) as db:
+        cached = self._cached_stat('by_department')
+        if cached is not None:
+            return cached
+
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 '''SELECT u.department, COUNT(e.id) as event_count
@@ -395,21 +699,35 @@ class Database:
                    ORDER BY event_count DESC'''
             ) as cursor:
                 rows = await cursor.fetchall()
-                return [dict(row) for row in rows]
+                result = [dict(row) for row in rows]
+
+        self._stats_cache['by_department'] = (time.monotonic() + STATS_CACHE_TTL, result)
+        return result
 
     async def get_total_events_count(self) -> int:
         """Get total number of events."""
-        async with aiosqlite.connect(self.db_path) as db:
+        cached = self._cached_stat('total')
+        if cached is not None:
+            return cached
+
+        async with self._connect() as db:
             async with db.execute(
                 'SELECT COUNT(*) as count FROM events WHERE is_cancelled = 0'
             ) as cursor:
                 row = await cursor.fetchone()
-                return row[0] if row else 0
+                result = row[0] if row else 0
+
+        self._stats_cache['total'] = (time.monotonic() + STATS_CACHE_TTL, result)
+        return result
 
     # Department operations
     async def get_all_departments(self, active_only: bool = True) -> List[Dict[str, Any]]:
         """Get all departments with id and name."""
-        async with aiosqlite.connect(self.db_path) as db:
+        # Active departments only change through this class, so they are cached
+        if active_only and self._dept_cache is not None:
+            return list(self._dept_cache)
+
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             query = 'SELECT id, name FROM departments'
             if active_only:
@@ -418,7 +736,12 @@ class Database:
 
             async with db.execute(query) as cursor:
                 rows = await cursor.fetchall()
-                return [{'id': row['id'], 'name': row['name']} for row in rows]
+                departments = [{'id': row['id'], 'name': row['name']} for row in rows]
+
+        if active_only:
+            self._dept_cache = departments
+            return list(departments)
+        return departments
 
     async def get_all_department_names(self, active_only: bool = True) -> List[str]:
         """Get all department names only (for backward compatibility)."""
@@ -427,7 +750,7 @@ class Database:
 
     async def get_department_by_id(self, dept_id: int) -> Optional[Dict[str, Any]]:
         """Get department by ID."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 'SELECT id, name, is_active FROM departments WHERE id = ?',
@@ -439,21 +762,54 @@ class Database:
     async def delete_department_by_id(self, dept_id: int) -> bool:
         """Soft delete a department by ID."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connect() as db:
                 await db.execute(
                     'UPDATE departments SET is_active = 0 WHERE id = ?',
                     (dept_id,)
                 )
                 await db.commit()
+                self._dept_cache = None
                 return True
         except Exception as e:
-            print(f"Error deleting department by id: {e}")
+            logger.error("Error deleting department by id: %s", e)
             return False
 
+    async def delete_department_returning(self, dept_id: int) -> Optional[str]:
+        """
+        Soft delete a department by ID in a single query.
+
+        Deleting one that is already inactive (e.g. from a stale list) succeeds
+        as well, like delete_department_by_id.
+
+        Args:
+            dept_id: Department ID
+
+        Returns:
+            Name of the deleted department, or None if there is no such department
+        """
+        try:
+            async with self._connect() as db:
+                async with db.execute(
+                    'UPDATE departments SET is_active = 0 WHERE id = ? RETURNING name',
+                    (dept_id,)
+                ) as cursor:
+                    row = await cursor.fetchone()
+                await db.commit()
+        except Exception as e:
+            logger.error("Error deleting department by id: %s", e)
+            return None
+
+        if row is None:
+            return None
+
+        if self._dept_cache is not None:
+            self._dept_cache = [dept for dept in self._dept_cache if dept['id'] != dept_id]
+        return row[0]
+
     async def add_department(self, name: str) -> bool:
         """Add a new department or reactivate if it was soft-deleted."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connect() as db:
                 # Check if department already exists (active or inactive)
                 async with db.execute(
                     'SELECT id, is_active FROM departments WHERE name = ?',
@@ -473,6 +829,7 @@ class Database:
                             (dept_id,)
                         )
                         await db.commit()
+                        self._dept_cache = None
                         return True
                 else:
                     # Insert new department
@@ -481,23 +838,25 @@ class Database:
                         (name,)
                     )
                     await db.commit()
+                    self._dept_cache = None
                     return True
         except Exception as e:
-            print(f"Error adding department: {e}")
+            logger.error("Error adding department: %s", e)
             return False
 
     async def delete_department(self, name: str) -> bool:
         """Soft delete a department."""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._connect() as db:
                 await db.execute(
                     'UPDATE departments SET is_active = 0 WHERE name = ?',
                     (name,)
                 )
                 await db.commit()
+                self._dept_cache = None
                 return True
         except Exception as e:
-            print(f"Error deleting department: {e}")
+            logger.error("Error deleting department: %s", e)
             return False
 
 
@@ -1,14 +1,155 @@
 """Google Sheets integration module."""
+import asyncio
 import gspread
 import logging
+import random
+import re
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache, wraps
 from oauth2client.service_account import ServiceAccountCredentials
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import config
 from datetime import datetime
 import pytz
 
 logger = logging.getLogger(__name__)
 
+# Resolved once; config.TIMEZONE does not change at runtime
+_LOCAL_TZ = pytz.timezone(config.TIMEZONE)
+
+# Boundary used when no future event is left in the sheet
+_NO_BOUNDARY = pytz.utc.localize(datetime.max)
+
+# "DD.MM.YYYY HH:MM" - validates and splits a Sana/Vaqt pair in one match
+_DT_RE = re.compile(r'^(\d{1,2})\.(\d{1,2})\.(\d{4}) (\d{1,2}):(\d{2})$')
+
+# Grid sizing: the past sheet only ever grows, so it starts larger and is
+# extended in big steps instead of letting appends grow it row by row
+_PAST_SHEET_ROWS = 5000
+_ROWS_GROW_STEP = 1000
+
+# Columns A:D (ID, Tadbir nomi, Sana, Vaqt) are all that sorting, lookups and
+# past/future checks need, so only they are read and cached
+_CACHED_RANGE = 'A1:D'
+_CACHED_COLS = 4
+
+# Sheets API quota handling: writes are paced just under the 60/minute cap and
+# quota/server errors are retried with capped exponential backoff
+_WRITES_PER_MINUTE = 55
+_RETRY_STATUSES = (429, 500, 503)
+_RETRY_MAX_TIME = 60
+_RETRY_MAX_DELAY = 32
+
+# Background write queue: operations submitted by handlers are applied in
+# groups of up to _FLUSH_MAX_OPS, collected for at most _FLUSH_INTERVAL seconds
+_FLUSH_MAX_OPS = 50
+_FLUSH_INTERVAL = 0.5
+
+# Event keys in sheet column order (A:J) and the comment shown when none is given
+_ROW_KEYS = ('id', 'title', 'date', 'time', 'place', 'comment',
+             'creator_department', 'creator_name', 'creator_phone', 'created_at')
+_NO_COMMENT = "Izoh yo'q"
+
+# Row background colors
+_WHITE = {'red': 1.0, 'green': 1.0, 'blue': 1.0}
+_GRAY = {'red': 0.95, 'green': 0.95, 'blue': 0.95}
+_RED = {'red': 1.0, 'green': 0.8, 'blue': 0.8}
+
+# Operations whose requests target existing main-sheet rows by number
+_ROW_TARGETING_OPS = frozenset({
+    '_sync_update_event', '_sync_delete_event', '_sync_mark_event_cancelled', '_sync_mark_past_events'
+})
+
+
+class _RateLimiter:
+    """Sliding-window limiter allowing at most `rate` calls in any `per` seconds."""
+
+    def __init__(self, rate: int, per: float):
+        self.rate = rate
+        self.per = per
+        self._calls = deque()
+
+    def acquire(self):
+        """Block until another call is allowed, then record it."""
+        now = time.monotonic()
+        while self._calls and now - self._calls[0] >= self.per:
+            self._calls.popleft()
+
+        if len(self._calls) >= self.rate:
+            wait = self.per - (now - self._calls.popleft())
+            logger.info("Sheets write limit reached, waiting %.1fs", wait)
+            time.sleep(wait)
+            now = time.monotonic()
+
+        self._calls.append(now)
+
+
+def _with_backoff(func):
+    """
+    Retry a Sheets API call on 429/500/503 responses.
+
+    Waits for Retry-After when the response has one, otherwise backs off
+    exponentially (1s, 2s, 4s ... capped) with jitter, and gives up once the
+    next attempt would start more than a minute after the first one.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        deadline = time.monotonic() + _RETRY_MAX_TIME
+        delay = 1
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                if e.code not in _RETRY_STATUSES:
+                    raise
+
+                retry_after = e.response.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    wait = min(int(retry_after), _RETRY_MAX_DELAY)
+                else:
+                    wait = delay + random.uniform(0, 1)
+                if time.monotonic() + wait > deadline:
+                    raise
+
+                logger.warning("Sheets API error %s, retrying in %.1fs", e.code, wait)
+                time.sleep(wait)
+                delay = min(delay * 2, _RETRY_MAX_DELAY)
+    return wrapper
+
+
+def _row_runs(row_nums: List[int]) -> List[Tuple[int, int]]:
+    """Group row numbers into contiguous (first, last) runs, in ascending order."""
+    runs = []
+    for row_num in sorted(set(row_nums)):
+        if runs and runs[-1][1] == row_num - 1:
+            runs[-1] = (runs[-1][0], row_num)
+        else:
+            runs.append((row_num, row_num))
+    return runs
+
+
+@lru_cache(maxsize=4096)
+def _parse_row_datetime(date_str: str, time_str: str) -> Optional[datetime]:
+    """Parse Sana (DD.MM.YYYY) and Vaqt (HH:MM) cells into an aware datetime."""
+    match = _DT_RE.match(f"{date_str} {time_str}")
+    if not match:
+        return None
+
+    day, month, year, hour, minute = map(int, match.groups())
+    try:
+        return _LOCAL_TZ.localize(datetime(year, month, day, hour, minute))
+    except ValueError:
+        return None
+
+
+def _event_sort_key(event: Dict[str, Any]):
+    """Chronological sort key for event dicts; unparseable dates sort last."""
+    event_datetime = _parse_row_datetime(event.get('date', ''), event.get('time', ''))
+    return (event_datetime is None, event_datetime or _NO_BOUNDARY)
+
 
 class GoogleSheetsManager:
     """Manager for Google Sheets operations."""
@@ -20,8 +161,41 @@ class GoogleSheetsManager:
         self.worksheet = None  # Main sheet for upcoming events
         self.past_worksheet = None  # Sheet for past events
         self._initialized = False
-
-    def initialize(self):
+        # Earliest future event seen by the last mark_past_events run;
+        # nothing can become past before it (None = unknown, must run)
+        self._next_boundary_crossing: Optional[datetime] = None
+        # Sheets API requests waiting to be sent in one batch_update
+        self._pending: List[Dict[str, Any]] = []
+        self._batch_depth = 0
+        # Whether the outermost batch() that last exited got its requests sent
+        self._last_batch_sent = True
+        # Whether the main sheet was re-read during the current batch (see _refresh_rows)
+        self._rows_checked = False
+        # Sheet rows per worksheet id as (fetched_at, rows); kept in step with
+        # queued writes so bursts of operations don't re-read the whole sheet
+        self._rows_cache: Dict[int, Tuple[float, List[List[str]]]] = {}
+        self._cache_ttl = 30
+        # Main-sheet rows with a parseable date/time, sorted by datetime, with
+        # their (cached) row numbers alongside; rebuilt whenever rows are refetched
+        self._future_dts: List[datetime] = []
+        self._future_row_nums: List[int] = []
+        # Event ID (column A) -> cached main-sheet row number
+        self._id_to_row: Dict[str, int] = {}
+        # Serialises sheet operations run in worker threads (created on first use,
+        # inside the running event loop)
+        self._lock: Optional[asyncio.Lock] = None
+        self._write_limiter = _RateLimiter(_WRITES_PER_MINUTE, 60)
+        # Background initialization (see start_initialize) and the operations
+        # requested before it finished, as (sync method, args) in call order
+        self._initializing = False
+        self._init_task: Optional[asyncio.Task] = None
+        self._deferred: List[Tuple[Any, tuple]] = []
+        # Fire-and-forget writes (see queue_add_event & co.) and the task
+        # applying them; both created on first use
+        self._submitted: Optional[asyncio.Queue] = None
+        self._flusher_task: Optional[asyncio.Task] = None
+
+    def _sync_initialize(self):
         """Initialize connection to Google Sheets."""
         try:
             # Define the scope
@@ -42,37 +216,39 @@ class GoogleSheetsManager:
             if config.GOOGLE_SPREADSHEET_ID:
                 self.spreadsheet = self.client.open_by_key(config.GOOGLE_SPREADSHEET_ID)
 
-                # Get or create the main worksheet for upcoming events
-                try:
-                    self.worksheet = self.spreadsheet.worksheet("Tadbirlar")
-                except gspread.exceptions.WorksheetNotFound:
-                    self.worksheet = self.spreadsheet.add_worksheet(
-                        title="Tadbirlar",
-                        rows=1000,
-                        cols=10
-                    )
-                    self._setup_headers(self.worksheet)
-
-                # Get or create the worksheet for past events
-                try:
-                    self.past_worksheet = self.spreadsheet.worksheet("Otgan tadbirlar")
-                except gspread.exceptions.WorksheetNotFound:
-                    self.past_worksheet = self.spreadsheet.add_worksheet(
-                        title="Otgan tadbirlar",
-                        rows=1000,
-                        cols=10
-                    )
-                    self._setup_headers(self.past_worksheet)
+                # Header rows of newly created sheets go out in one batch_update
+                with self.batch():
+                    # Get or create the main worksheet for upcoming events
+                    try:
+                        self.worksheet = self.spreadsheet.worksheet("Tadbirlar")
+                    except gspread.exceptions.WorksheetNotFound:
+                        self.worksheet = self.spreadsheet.add_worksheet(
+                            title="Tadbirlar",
+                            rows=1000,
+                            cols=10
+                        )
+                        self._setup_headers(self.worksheet)
+
+                    # Get or create the worksheet for past events
+                    try:
+                        self.past_worksheet = self.spreadsheet.worksheet("Otgan tadbirlar")
+                    except gspread.exceptions.WorksheetNotFound:
+                        self.past_worksheet = self.spreadsheet.add_worksheet(
+                            title="Otgan tadbirlar",
+                            rows=_PAST_SHEET_ROWS,
+                            cols=10
+                        )
+                        self._setup_headers(self.past_worksheet)
 
                 self._initialized = True
-                print("Google Sheets initialized successfully (Tadbirlar + Otgan tadbirlar)")
+                logger.info("Google Sheets initialized successfully (Tadbirlar + Otgan tadbirlar)")
             else:
-                print("Warning: GOOGLE_SPREADSHEET_ID not configured")
+                logger.warning("GOOGLE_SPREADSHEET_ID not configured")
 
         except FileNotFoundError:
-            print(f"Warning: Credentials file {config.GOOGLE_SHEETS_CREDENTIALS_FILE} not found")
+            logger.warning("Credentials file %s not found", config.GOOGLE_SHEETS_CREDENTIALS_FILE)
         except Exception as e:
-            print(f"Error initializing Google Sheets: {e}")
+            logger.error("Error initializing Google Sheets: %s", e)
 
     def _setup_headers(self, worksheet):
         """Setup header row in the worksheet."""
@@ -89,17 +265,450 @@ class GoogleSheetsManager:
             "Yaratilgan vaqt"
         ]
 
+        # Header values, bold text and background in one batch
+        self._queue(
+            {
+                'updateCells': {
+                    'range': self._row_range(worksheet, 1),
+                    'rows': [self._row_data(headers)],
+                    'fields': 'userEnteredValue'
+                }
+            },
+            {
+                'repeatCell': {
+                    'range': self._row_range(worksheet, 1),
+                    'cell': {'userEnteredFormat': {
+                        'textFormat': {'bold': True},
+                        'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
+                    }},
+                    'fields': 'userEnteredFormat(textFormat,backgroundColor)'
+                }
+            }
+        )
+
+    @_with_backoff
+    def _api_read(self, func, *args, **kwargs):
+        """Call a read-only gspread method, retrying quota and server errors."""
+        return func(*args, **kwargs)
+
+    @_with_backoff
+    def _api_write(self, func, *args, **kwargs):
+        """Call a mutating gspread method, paced by the write limiter and retried."""
+        self._write_limiter.acquire()
+        return func(*args, **kwargs)
+
+    @contextmanager
+    def batch(self):
+        """
+        Defer queued writes and send them as one batch_update on exit.
+
+        Nested batches join the outermost one, which sends everything queued
+        inside it; see _batch_result() for the outcome.
+        """
+        if self._batch_depth == 0:
+            self._rows_checked = False
+        self._batch_depth += 1
         try:
-            worksheet.update('A1:J1', [headers])
-            # Format header row
-            worksheet.format('A1:J1', {
-                'textFormat': {'bold': True},
-                'backgroundColor': {'red': 0.9, 'green': 0.9, 'blue': 0.9}
-            })
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._last_batch_sent = self._send_pending()
+
+    def _batch_result(self) -> bool:
+        """
+        Outcome of the writes of a batch() block that has just exited.
+
+        The send result when it was the outermost batch; True when nested,
+        since its requests go out with the enclosing batch like any deferred
+        _queue() call.
+        """
+        return self._last_batch_sent if self._batch_depth == 0 else True
+
+    def flush(self) -> bool:
+        """
+        Send all queued requests in a single spreadsheets.batchUpdate call.
+
+        Does nothing inside batch(): the outermost batch sends them on exit.
+        """
+        if self._batch_depth > 0:
+            return True
+        return self._send_pending()
+
+    def _send_pending(self) -> bool:
+        """Send the queued requests now, even inside batch() (see flush())."""
+        if not self._pending:
+            return True
+
+        requests = self._pending
+        self._pending = []
+        try:
+            self._api_write(self.spreadsheet.batch_update, {'requests': requests})
+            return True
         except Exception as e:
-            print(f"Error setting up headers: {e}")
+            # Dropped rather than retried so one bad request can't block later writes
+            logger.error("Error flushing %d queued Google Sheets requests: %s", len(requests), e)
+            # Cached rows already include the dropped writes, and any rows
+            # being moved to the past sheet were not moved
+            self._rows_cache.clear()
+            self._next_boundary_crossing = None
+            return False
+
+    def _discard_pending(self, keep: int):
+        """Drop the requests queued after the first ``keep`` without sending them."""
+        del self._pending[keep:]
+        # Cached rows already include the dropped writes
+        self._rows_cache.clear()
+
+    def _cached_values(self, worksheet) -> List[List[str]]:
+        """
+        Return columns A:D of all rows, re-reading them only when the cache is stale.
+
+        The returned list is the cache itself and already reflects queued writes.
+        Trailing empty cells are not included, so rows may be shorter than 4.
+        """
+        entry = self._rows_cache.get(worksheet.id)
+        if entry is not None and time.monotonic() - entry[0] < self._cache_ttl:
+            return entry[1]
+
+        # Queued writes must reach the server before it is read back, even
+        # inside a batch
+        self._send_pending()
+        rows = list(self._api_read(worksheet.get, _CACHED_RANGE))
+        self._rows_cache[worksheet.id] = (time.monotonic(), rows)
+        if worksheet is self.worksheet:
+            self._build_row_index(rows)
+        return rows
+
+    def _build_row_index(self, rows: List[List[str]]):
+        """Parse every main-sheet row once into the sorted datetime and ID indexes."""
+        entries = []
+        self._id_to_row = {}
+        for idx, row in enumerate(rows[1:], start=2):  # Start from row 2
+            if row and row[0]:
+                self._id_to_row[row[0]] = idx
+            if len(row) < 4:
+                continue
+            row_datetime = _parse_row_datetime(row[2], row[3])
+            if row_datetime is not None:
+                entries.append((row_datetime, idx))
+
+        entries.sort()
+        self._future_dts = [entry[0] for entry in entries]
+        self._future_row_nums = [entry[1] for entry in entries]
+
+    def _index_row_inserted(self, row_num: int, values: List[Any]):
+        """Shift indexed rows at or below row_num and index the new row."""
+        row_nums = self._future_row_nums
+        for i, indexed_row in enumerate(row_nums):
+            if indexed_row >= row_num:
+                row_nums[i] = indexed_row + 1
+
+        id_to_row = self._id_to_row
+        for event_id, indexed_row in id_to_row.items():
+            if indexed_row >= row_num:
+                id_to_row[event_id] = indexed_row + 1
+        if values and values[0] not in (None, ''):
+            id_to_row[str(values[0])] = row_num
+
+        if len(values) < 4:
+            return
+        row_datetime = _parse_row_datetime(str(values[2]), str(values[3]))
+        if row_datetime is None:
+            return
+
+        pos = bisect_right(self._future_dts, row_datetime)
+        self._future_dts.insert(pos, row_datetime)
+        row_nums.insert(pos, row_num)
+
+    def _index_row_deleted(self, row_num: int):
+        """Drop row_num from the index and shift the rows below it up."""
+        row_nums = self._future_row_nums
+        if row_num in row_nums:
+            pos = row_nums.index(row_num)
+            del self._future_dts[pos]
+            del row_nums[pos]
+
+        for i, indexed_row in enumerate(row_nums):
+            if indexed_row > row_num:
+                row_nums[i] = indexed_row - 1
+
+        id_to_row = self._id_to_row
+        for event_id, indexed_row in list(id_to_row.items()):
+            if indexed_row == row_num:
+                del id_to_row[event_id]
+            elif indexed_row > row_num:
+                id_to_row[event_id] = indexed_row - 1
+
+    def _index_row_replaced(self, row_num: int, values: List[Any]):
+        """Re-index a row whose values changed without it moving."""
+        row_nums = self._future_row_nums
+        if row_num in row_nums:
+            pos = row_nums.index(row_num)
+            del self._future_dts[pos]
+            del row_nums[pos]
+
+        row_datetime = None
+        if len(values) >= 4:
+            row_datetime = _parse_row_datetime(str(values[2]), str(values[3]))
+        if row_datetime is not None:
+            pos = bisect_right(self._future_dts, row_datetime)
+            self._future_dts.insert(pos, row_datetime)
+            row_nums.insert(pos, row_num)
+
+    def _future_insert_position(self, event_datetime: datetime, now: datetime) -> int:
+        """
+        Row number that keeps future events in chronological order.
 
-    def add_event(self, event: Dict[str, Any]) -> bool:
+        Among rows not yet past, the event goes before the first later one,
+        else right after the last of them, else at row 2.
+        """
+        first_future = bisect_left(self._future_dts, now)
+        if first_future == len(self._future_dts):
+            return 2
+
+        pos = bisect_right(self._future_dts, event_datetime, lo=first_future)
+        if pos < len(self._future_dts):
+            return self._future_row_nums[pos]
+        return self._future_row_nums[-1] + 1
+
+    def _cached_rows(self, worksheet) -> Optional[List[List[str]]]:
+        """Cached rows of a worksheet to patch after a local write, if any."""
+        entry = self._rows_cache.get(worksheet.id)
+        return entry[1] if entry is not None else None
+
+    def _queue(self, *requests: Dict[str, Any]) -> bool:
+        """
+        Queue requests; they are sent right away unless inside batch().
+
+        Returns:
+            Result of the flush when sent right away, True when deferred
+        """
+        self._pending.extend(requests)
+        if self._batch_depth == 0:
+            return self._send_pending()
+        return True
+
+    def _refresh_rows(self):
+        """
+        Re-read the main sheet before writes that target existing rows by number.
+
+        Cached rows can be up to _cache_ttl seconds old; if someone moved rows
+        by hand meanwhile, deletes and updates would hit another event's row.
+        Inside batch() the sheet is read once, and not at all once writes are
+        queued (reading would send them early); later rows come from the cache
+        that follows the queued writes.
+        """
+        if self._pending or (self._batch_depth > 0 and self._rows_checked):
+            return
+        self._rows_cache.pop(self.worksheet.id, None)
+        self._cached_values(self.worksheet)
+        self._rows_checked = True
+
+    def _find_row(self, event_id: int) -> Optional[int]:
+        """Main-sheet row number of an event, looked up by its ID column."""
+        self._refresh_rows()
+        return self._id_to_row.get(str(event_id))
+
+    def _queue_row_delete(self, row_num: int) -> bool:
+        """Queue deletion of a main-sheet row given its cached row number."""
+        return self._queue_rows_delete([row_num])
+
+    def _queue_rows_delete(self, row_nums: List[int]) -> bool:
+        """
+        Queue deletion of main-sheet rows given their cached row numbers.
+
+        Adjacent rows are removed with one deleteDimension per contiguous block,
+        bottom-up so the remaining indices stay valid.
+
+        Returns:
+            False if there is nothing to delete or the write failed
+        """
+        if not row_nums:
+            return False
+
+        rows = self._cached_rows(self.worksheet)
+        requests = []
+        for first, last in reversed(_row_runs(row_nums)):
+            if rows is not None and last <= len(rows):
+                del rows[first - 1:last]
+                for row_num in range(last, first - 1, -1):
+                    self._index_row_deleted(row_num)
+            requests.append({
+                'deleteDimension': {
+                    'range': {
+                        'sheetId': self.worksheet.id,
+                        'dimension': 'ROWS',
+                        'startIndex': first - 1,
+                        'endIndex': last
+                    }
+                }
+            })
+        return self._queue(*requests)
+
+    @staticmethod
+    def _row_range(worksheet, row_num: int, start_col: int = 0, end_col: int = 10) -> Dict[str, Any]:
+        """GridRange for one row (1-based row_num, 0-based half-open columns A:J)."""
+        return {
+            'sheetId': worksheet.id,
+            'startRowIndex': row_num - 1,
+            'endRowIndex': row_num,
+            'startColumnIndex': start_col,
+            'endColumnIndex': end_col
+        }
+
+    @staticmethod
+    def _row_data(values: List[Any], background: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """RowData with the cell values and, optionally, a background color."""
+        cells = []
+        for value in values:
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                cell = {'userEnteredValue': {'numberValue': value}}
+            else:
+                cell = {'userEnteredValue': {'stringValue': '' if value is None else str(value)}}
+            if background is not None:
+                cell['userEnteredFormat'] = {'backgroundColor': background}
+            cells.append(cell)
+        return {'values': cells}
+
+    @staticmethod
+    def _row_strings(values: List[Any]) -> List[str]:
+        """Cached (A:D) part of a row, as the sheet would read it back."""
+        return ['' if value is None else str(value) for value in values[:_CACHED_COLS]]
+
+    @staticmethod
+    def _row_fields(background: Optional[Dict[str, float]]) -> str:
+        """Field mask matching what _row_data() sets."""
+        if background is None:
+            return 'userEnteredValue'
+        return 'userEnteredValue,userEnteredFormat.backgroundColor'
+
+    def _queue_append_row(self, worksheet, values: List[Any],
+                          background: Optional[Dict[str, float]] = None) -> bool:
+        """Queue a row (values and color together) after the last row with data."""
+        return self._queue_append_rows(worksheet, [(values, background)])
+
+    def _queue_append_rows(self, worksheet,
+                           rows_with_colors: List[Tuple[List[Any], Optional[Dict[str, float]]]]) -> bool:
+        """
+        Queue one appendCells request for several rows, each with its own color.
+
+        All rows share one field mask, so backgrounds are written for every row
+        as soon as any of them has one.
+        """
+        background = next((bg for _, bg in rows_with_colors if bg is not None), None)
+        rows = self._cached_rows(worksheet)
+        if rows is not None:
+            for values, _ in rows_with_colors:
+                rows.append(self._row_strings(values))
+                if worksheet is self.worksheet:
+                    self._index_row_inserted(len(rows), values)
+        return self._queue({
+            'appendCells': {
+                'sheetId': worksheet.id,
+                'rows': [self._row_data(values, bg) for values, bg in rows_with_colors],
+                'fields': self._row_fields(background)
+            }
+        })
+
+    def _queue_insert_row(self, worksheet, row_num: int, values: List[Any],
+                          background: Optional[Dict[str, float]] = None) -> bool:
+        """Queue inserting a row at row_num and filling its values and color."""
+        rows = self._cached_rows(worksheet)
+        if rows is not None:
+            rows.insert(row_num - 1, self._row_strings(values))
+            if worksheet is self.worksheet:
+                self._index_row_inserted(row_num, values)
+        return self._queue(
+            {
+                'insertDimension': {
+                    'range': {
+                        'sheetId': worksheet.id,
+                        'dimension': 'ROWS',
+                        'startIndex': row_num - 1,
+                        'endIndex': row_num
+                    },
+                    'inheritFromBefore': False
+                }
+            },
+            {
+                'updateCells': {
+                    'range': self._row_range(worksheet, row_num),
+                    'rows': [self._row_data(values, background)],
+                    'fields': self._row_fields(background)
+                }
+            }
+        )
+
+    def _queue_row_update(self, worksheet, row_num: int, values: List[Any],
+                          background: Optional[Dict[str, float]] = None) -> bool:
+        """Queue rewriting the values and color of an existing row in place."""
+        rows = self._cached_rows(worksheet)
+        if rows is not None and row_num <= len(rows):
+            rows[row_num - 1] = self._row_strings(values)
+            if worksheet is self.worksheet:
+                self._index_row_replaced(row_num, values)
+        return self._queue({
+            'updateCells': {
+                'range': self._row_range(worksheet, row_num),
+                'rows': [self._row_data(values, background)],
+                'fields': self._row_fields(background)
+            }
+        })
+
+    def _queue_row_color(self, worksheet, row_num: int, background: Dict[str, float],
+                         last_row: Optional[int] = None) -> bool:
+        """Queue a background color for columns A:J of one row (or rows up to last_row)."""
+        grid_range = self._row_range(worksheet, row_num)
+        if last_row is not None:
+            grid_range['endRowIndex'] = last_row
+        return self._queue({
+            'repeatCell': {
+                'range': grid_range,
+                'cell': {'userEnteredFormat': {'backgroundColor': background}},
+                'fields': 'userEnteredFormat.backgroundColor'
+            }
+        })
+
+    @staticmethod
+    def _event_row(event: Dict[str, Any], now: datetime) -> List[Any]:
+        """Sheet row values (columns A:J) for an event."""
+        row = [event.get(key, '') for key in _ROW_KEYS]
+        # Only missing keys get a default; the timestamp is formatted on demand
+        if 'comment' not in event:
+            row[5] = _NO_COMMENT
+        if 'created_at' not in event:
+            row[9] = now.strftime('%Y-%m-%d %H:%M:%S')
+        return row
+
+    def _note_event_datetime(self, event_datetime: datetime):
+        """A new earlier (or past) row must be picked up by mark_past_events."""
+        if (self._next_boundary_crossing is not None
+                and event_datetime < self._next_boundary_crossing):
+            self._next_boundary_crossing = event_datetime
+
+    def _keeps_position(self, row_num: int, event_datetime: datetime, now: datetime) -> bool:
+        """
+        Check whether a future row re-dated to event_datetime stays where it is.
+
+        True when the row is indexed as a future event and the new datetime still
+        sorts between its future neighbours.
+        """
+        row_nums = self._future_row_nums
+        if event_datetime < now or row_num not in row_nums:
+            return False
+
+        dts = self._future_dts
+        pos = row_nums.index(row_num)
+        if dts[pos] < now:
+            return False
+        if pos > 0 and dts[pos - 1] >= now and event_datetime < dts[pos - 1]:
+            return False
+        if pos + 1 < len(dts) and event_datetime >= dts[pos + 1]:
+            return False
+        return True
+
+    def _sync_add_event(self, event: Dict[str, Any]) -> bool:
         """
         Add a new event to Google Sheets, sorted by date and time.
 
@@ -116,204 +725,245 @@ class GoogleSheetsManager:
             return False
 
         try:
-            # Get current time in Tashkent timezone
-            local_tz = pytz.timezone(config.TIMEZONE)
-            local_now = datetime.now(local_tz).strftime('%Y-%m-%d %H:%M:%S')
+            # Get current time in Tashkent timezone (read the clock once per call)
+            now = datetime.now(_LOCAL_TZ)
 
             # Prepare row data for insertion
-            row_data = [
-                event.get('id', ''),
-                event.get('title', ''),
-                event.get('date', ''),
-                event.get('time', ''),
-                event.get('place', ''),
-                event.get('comment', 'Izoh yo\'q'),
-                event.get('creator_department', ''),
-                event.get('creator_name', ''),
-                event.get('creator_phone', ''),
-                event.get('created_at', local_now)
-            ]
+            row_data = self._event_row(event, now)
 
             # Parse event date and time for sorting and past/future check
-            try:
-                event_date = event.get('date', '')
-                event_time = event.get('time', '')
-                day, month, year = map(int, event_date.split('.'))
-                hour, minute = map(int, event_time.split(':'))
-                event_datetime = local_tz.localize(datetime(year, month, day, hour, minute))
-
-                # Check if event is in the past
-                now = datetime.now(local_tz)
-                is_past = event_datetime < now
-
-            except Exception as e:
-                print(f"Error parsing event datetime: {e}")
+            event_datetime = _parse_row_datetime(event.get('date', ''), event.get('time', ''))
+            if event_datetime is None:
+                logger.error("Error parsing event datetime: %s %s", event.get('date'), event.get('time'))
                 # If parsing fails, append to the end without formatting
-                self.worksheet.append_row(row_data)
-                return True
+                return self._queue_append_row(self.worksheet, row_data)
+
+            # Check if event is in the past
+            is_past = event_datetime < now
+            self._note_event_datetime(event_datetime)
 
             # Get all existing rows (skip header)
-            all_values = self.worksheet.get_all_values()
+            all_values = self._cached_values(self.worksheet)
 
             # Case 1: Empty sheet (only header or no data)
             if len(all_values) <= 1:
-                self.worksheet.append_row(row_data)
-                new_row_num = 2  # First data row
-                # Apply gray background for past events
-                if is_past:
-                    self.worksheet.format(f'A{new_row_num}:J{new_row_num}', {
-                        'backgroundColor': {'red': 0.95, 'green': 0.95, 'blue': 0.95}
-                    })
-                    print(f"Added first event (past) to row {new_row_num} with gray background")
-                else:
-                    print(f"Added first event (future) to row {new_row_num}")
+                # Row values and background are written by one batch_update
+                if not self._queue_append_row(self.worksheet, row_data, _GRAY if is_past else _WHITE):
+                    return False
+                logger.info("Added first event (%s) to row 2", 'past' if is_past else 'future')
                 return True
 
             # Case 2: Event is in the past - add to the very bottom with gray background
             if is_past:
-                self.worksheet.append_row(row_data)
-                # Get the row number of the newly added row
-                all_values = self.worksheet.get_all_values()
-                new_row_num = len(all_values)
-                # Apply gray background for past events
-                self.worksheet.format(f'A{new_row_num}:J{new_row_num}', {
-                    'backgroundColor': {'red': 0.95, 'green': 0.95, 'blue': 0.95}
-                })
-                print(f"Added past event to bottom row {new_row_num} with gray background")
+                new_row_num = len(all_values) + 1
+                if not self._queue_append_row(self.worksheet, row_data, _GRAY):
+                    return False
+                logger.info("Added past event to bottom row %d with gray background", new_row_num)
                 return True
 
             # Case 3: Event is in the future - find correct sorted position
-            # We need to insert in chronological order among future events
-            insert_position = None
-            last_future_event_row = None
-
-            for idx, row in enumerate(all_values[1:], start=2):  # Start from row 2 (skip header)
-                if len(row) < 4:  # Not enough columns
-                    continue
-
-                try:
-                    row_date = row[2]  # Sana column (index 2)
-                    row_time = row[3]  # Vaqt column (index 3)
-
-                    if not row_date or not row_time:
-                        continue
-
-                    # Parse existing row date/time
-                    r_day, r_month, r_year = map(int, row_date.split('.'))
-                    r_hour, r_minute = map(int, row_time.split(':'))
-                    row_datetime = local_tz.localize(datetime(r_year, r_month, r_day, r_hour, r_minute))
-
-                    # Track last future event row
-                    if row_datetime >= now:
-                        last_future_event_row = idx
-                        # If new event is earlier than this future event, insert here
-                        if event_datetime < row_datetime:
-                            insert_position = idx
-                            break
-                except Exception as e:
-                    print(f"Error parsing row {idx}: {e}")
-                    continue
+            # with a binary search on the cached datetime index
+            position = self._future_insert_position(event_datetime, now)
 
-            # Insert at the correct position
-            if insert_position:
-                # Insert before the found future event
-                self.worksheet.insert_row(row_data, insert_position)
-                print(f"Inserted future event at row {insert_position}")
-            elif last_future_event_row:
-                # Insert after the last future event (before past events section)
-                self.worksheet.insert_row(row_data, last_future_event_row + 1)
-                print(f"Inserted future event after last future event at row {last_future_event_row + 1}")
-            else:
-                # No future events found, insert at row 2 (becomes first future event)
-                self.worksheet.insert_row(row_data, 2)
-                print(f"Inserted as first future event at row 2")
+            # Insert, values and white background are written by one batch_update
+            if not self._queue_insert_row(self.worksheet, position, row_data, _WHITE):
+                return False
+            logger.info("Inserted future event at row %d", position)
 
             return True
 
         except Exception as e:
-            print(f"Error adding event to Google Sheets: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error adding event to Google Sheets: %s", e)
             return False
 
-    def update_event(self, event_id: int, event: Dict[str, Any]) -> bool:
+    def _sync_add_events_bulk(self, events: List[Dict[str, Any]]) -> bool:
+        """
+        Add several events with a single batch_update, all or none.
+
+        Each event is placed by _sync_add_event, in chronological order so the
+        past rows appended at the bottom stay sorted too.
+        """
+        if not self._initialized:
+            return False
+        if not events:
+            return True
+
+        with self.batch():
+            queued = len(self._pending)
+            for event in sorted(events, key=_event_sort_key):
+                if not self._sync_add_event(event):
+                    # All or nothing: the other operations in the batch still go out
+                    self._discard_pending(queued)
+                    return False
+        added = self._batch_result()
+
+        if added:
+            logger.info("Added %d events to Google Sheets in one batch", len(events))
+        return added
+
+    def _sync_update_event(self, event_id: int, event: Dict[str, Any]) -> bool:
         """Update an existing event in Google Sheets."""
         if not self._initialized:
             return False
 
         try:
-            # Find and delete the old row
-            cell = self.worksheet.find(str(event_id))
-            if not cell:
+            row_num = self._find_row(event_id)
+            if row_num is None:
                 return False
 
-            self.worksheet.delete_rows(cell.row)
-
-            # Re-add the event with updated data (will be inserted in correct sorted position)
-            return self.add_event(event)
+            now = datetime.now(_LOCAL_TZ)
+            event_datetime = _parse_row_datetime(event.get('date', ''), event.get('time', ''))
+
+            # Still sorts to the same place - rewrite the row with one updateCells
+            if event_datetime is not None and self._keeps_position(row_num, event_datetime, now):
+                self._note_event_datetime(event_datetime)
+                return self._queue_row_update(self.worksheet, row_num, self._event_row(event, now), _WHITE)
+
+            # Otherwise delete the old row and re-add the event in its sorted
+            # position, both in the same batch_update
+            with self.batch():
+                queued = len(self._pending)
+                self._queue_row_delete(row_num)
+                if not self._sync_add_event(event):
+                    # Never send the delete without the re-add
+                    self._discard_pending(queued)
+                    return False
+            return self._batch_result()
 
         except Exception as e:
-            print(f"Error updating event in Google Sheets: {e}")
+            logger.error("Error updating event in Google Sheets: %s", e)
             return False
 
-    def delete_event(self, event_id: int) -> bool:
+    def _sync_delete_event(self, event_id: int) -> bool:
         """Delete an event from Google Sheets."""
         if not self._initialized:
             return False
 
         try:
             # Find the row with the event ID
-            cell = self.worksheet.find(str(event_id))
-            if not cell:
+            row_num = self._find_row(event_id)
+            if row_num is None:
                 return False
 
-            self.worksheet.delete_rows(cell.row)
-            return True
+            return self._queue_row_delete(row_num)
 
         except Exception as e:
-            print(f"Error deleting event from Google Sheets: {e}")
+            logger.error("Error deleting event from Google Sheets: %s", e)
             return False
 
-    def mark_event_cancelled(self, event_id: int) -> bool:
+    def _sync_mark_event_cancelled(self, event_id: int) -> bool:
         """Mark an event as cancelled in Google Sheets."""
         if not self._initialized:
             return False
 
         try:
             # Find the row with the event ID
-            cell = self.worksheet.find(str(event_id))
-            if not cell:
+            row_num = self._find_row(event_id)
+            if row_num is None:
                 return False
 
-            row_num = cell.row
-
             # Add "[BEKOR QILINDI]" prefix to the title
-            title_cell = self.worksheet.cell(row_num, 2)  # Column B (title)
-            current_title = title_cell.value
+            row = self._cached_values(self.worksheet)[row_num - 1]
+            current_title = row[1] if len(row) > 1 else ''  # Column B (title)
 
             if not current_title.startswith("[BEKOR QILINDI]"):
                 new_title = f"[BEKOR QILINDI] {current_title}"
-                self.worksheet.update_cell(row_num, 2, new_title)
-
-                # Also mark the row with red background
-                self.worksheet.format(f'A{row_num}:J{row_num}', {
-                    'backgroundColor': {'red': 1.0, 'green': 0.8, 'blue': 0.8}
-                })
+                row[1:2] = [new_title]
+
+                # New title and red background go out in the same batch
+                self._queue(
+                    {
+                        'updateCells': {
+                            'range': self._row_range(self.worksheet, row_num, 1, 2),
+                            'rows': [{'values': [{'userEnteredValue': {'stringValue': new_title}}]}],
+                            'fields': 'userEnteredValue'
+                        }
+                    },
+                    {
+                        'repeatCell': {
+                            'range': self._row_range(self.worksheet, row_num),
+                            'cell': {'userEnteredFormat': {'backgroundColor': _RED}},
+                            'fields': 'userEnteredFormat.backgroundColor'
+                        }
+                    }
+                )
 
             return True
 
         except Exception as e:
-            print(f"Error marking event as cancelled in Google Sheets: {e}")
+            logger.error("Error marking event as cancelled in Google Sheets: %s", e)
             return False
 
     def is_connected(self) -> bool:
-        """Check if Google Sheets is connected."""
-        return self._initialized
+        """Check if Google Sheets is connected (or still connecting in the background)."""
+        return self._initialized or self._initializing
+
+    def _fetch_rows(self, worksheet, row_nums: List[int]) -> Dict[int, List[str]]:
+        """Read full A:J rows with one batch_get, one range per contiguous block."""
+        runs = _row_runs(row_nums)
+        value_ranges = self._api_read(worksheet.batch_get, [f'A{first}:J{last}' for first, last in runs])
+
+        rows = {}
+        for (first, last), value_range in zip(runs, value_ranges):
+            for offset in range(last - first + 1):
+                rows[first + offset] = list(value_range[offset]) if offset < len(value_range) else []
+        return rows
+
+    def _ensure_capacity(self, worksheet, rows_needed: int):
+        """Grow the worksheet grid with a single resize if it is too small."""
+        if worksheet.row_count >= rows_needed:
+            return
+
+        new_row_count = rows_needed + _ROWS_GROW_STEP
+        self._api_write(worksheet.resize, rows=new_row_count)
+        logger.info("Resized '%s' to %d rows", worksheet.title, new_row_count)
+
+    def _partition_rows(self, all_values, now: datetime, past_event_ids=None, known_event_ids=None):
+        """
+        Split sheet rows into past and future events.
+
+        With ``past_event_ids`` (from db.get_past_event_ids()) a row of an
+        event in ``known_event_ids`` (from db.get_event_ids(); all numeric IDs
+        when not given) is past when its ID is in the set. Other rows, such as
+        events since deleted from the database, fall back to parsing the
+        Sana/Vaqt columns against ``now``.
+
+        Returns:
+            Tuple (past, future) of (row_number, row) pairs: past rows oldest
+            first, future rows in sheet order. Rows without an ID and without
+            a parseable date/time are skipped.
+        """
+        past, future = [], []
+        for idx, row in enumerate(all_values[1:], start=2):  # Start from row 2
+            if len(row) < 4:
+                continue
+
+            if (past_event_ids is not None and row[0].isdigit()
+                    and (known_event_ids is None or int(row[0]) in known_event_ids)):
+                is_past = int(row[0]) in past_event_ids
+            else:
+                row_datetime = _parse_row_datetime(row[2], row[3])
+                if row_datetime is None:
+                    continue
+                is_past = row_datetime < now
+
+            (past if is_past else future).append((idx, row))
 
-    def mark_past_events(self):
+        # Only the (few) rows being archived are ordered by date
+        past.sort(key=lambda entry: (_parse_row_datetime(entry[1][2], entry[1][3]) or _NO_BOUNDARY, entry[0]))
+        return past, future
+
+    def _sync_mark_past_events(self, past_event_ids=None, known_event_ids=None):
         """
         Move all past events from "Tadbirlar" to "Otgan tadbirlar" sheet.
 
+        Args:
+            past_event_ids: Optional set of event IDs the database reports as
+                past; when given, rows are picked by ID instead of by parsing
+                their date/time.
+            known_event_ids: Optional set of all event IDs in the database;
+                rows with other IDs are picked by their date/time.
+
         Logic:
         - Past events (datetime < now): Move to "Otgan tadbirlar" with gray background
         - Cancelled past events: Move to "Otgan tadbirlar" with red background
@@ -329,117 +979,261 @@ class GoogleSheetsManager:
             try:
                 self.past_worksheet = self.spreadsheet.worksheet("Otgan tadbirlar")
             except Exception as e:
-                logger.error(f"Failed to connect to Otgan tadbirlar sheet: {e}")
+                logger.error("Failed to connect to Otgan tadbirlar sheet: %s", e)
                 return False
 
         # Log sheet info for debugging
-        logger.info(f"past_worksheet title: {self.past_worksheet.title}")
-        logger.info(f"past_worksheet id: {self.past_worksheet.id}")
+        logger.debug("past_worksheet title: %s", self.past_worksheet.title)
+        logger.debug("past_worksheet id: %s", self.past_worksheet.id)
 
-        try:
-            local_tz = pytz.timezone(config.TIMEZONE)
-            now = datetime.now(local_tz)
+        now = datetime.now(_LOCAL_TZ)
+
+        # Skip the whole pass while no event can have become past since the last run
+        if self._next_boundary_crossing is not None and now < self._next_boundary_crossing:
+            logger.debug("No event has become past since the last run, skipping")
+            return True
 
-            # Get all events from "Tadbirlar" sheet
-            all_values = self.worksheet.get_all_values()
+        # Row numbers below are used as-is for deletes and full rows are read
+        # back from the sheet, so queued writes must reach it first
+        self._send_pending()
+
+        try:
+            # Get all events from "Tadbirlar" sheet, re-read so hand edits
+            # made since the last read can't misdirect the deletes
+            self._refresh_rows()
+            all_values = self._cached_values(self.worksheet)
             if len(all_values) <= 1:  # Only header or empty
-                logger.info("No events to process in Tadbirlar sheet")
+                logger.debug("No events to process in Tadbirlar sheet")
+                self._next_boundary_crossing = _NO_BOUNDARY
                 return True
 
-            # Track rows to delete (in reverse order to avoid index shifting)
-            rows_to_delete = []
+            # Split rows into past/future by ID lookup (date parsing only as fallback)
+            past_entries, future_entries = self._partition_rows(
+                all_values, now, past_event_ids, known_event_ids
+            )
 
-            # Process each row to find past events
-            for idx, row in enumerate(all_values[1:], start=2):  # Start from row 2
-                if len(row) < 4:
-                    continue
+            # Only the rows being moved are read in full (A:J)
+            full_rows = self._fetch_rows(self.worksheet, [idx for idx, _ in past_entries]) if past_entries else {}
+
+            # Make room for all moved rows up front with one resize
+            past_row_num = len(self._cached_values(self.past_worksheet)) if past_entries else 0
+            if past_entries:
+                self._ensure_capacity(self.past_worksheet, past_row_num + len(past_entries))
+
+            # Appends to "Otgan tadbirlar", recolors and deletes in "Tadbirlar"
+            # all go out in one batch_update, so a row is either moved or left
+            # untouched - never copied twice or lost
+            with self.batch():
+                # Move past events (oldest first) with one appendCells;
+                # cancelled past events are red, regular ones gray
+                archived = []
+                for idx, row in past_entries:
+                    cancelled = row[1].startswith("[BEKOR QILINDI]")
+                    archived.append((full_rows[idx] or row, _RED if cancelled else _GRAY))
+                    past_row_num += 1
+                    logger.debug("Moving %spast event '%s' to Otgan tadbirlar row %d (%s)",
+                                 'cancelled ' if cancelled else '', row[1][:30], past_row_num,
+                                 'red' if cancelled else 'gray')
+                if archived:
+                    self._queue_append_rows(self.past_worksheet, archived)
+
+                # Future events - ensure white background (cancelled ones stay red);
+                # queued before the deletes so row numbers refer to the unshifted sheet
+                white_rows, red_rows = [], []
+                for idx, row in future_entries:
+                    if row[1].startswith("[BEKOR QILINDI]"):
+                        red_rows.append(idx)
+                    else:
+                        white_rows.append(idx)
 
-                try:
-                    # Get event data
-                    row_title = row[1] if len(row) > 1 else ""  # Tadbir nomi column
-                    row_date = row[2]  # Sana column
-                    row_time = row[3]  # Vaqt column
-
-                    if not row_date or not row_time:
-                        continue
-
-                    # Parse row date/time
-                    r_day, r_month, r_year = map(int, row_date.split('.'))
-                    r_hour, r_minute = map(int, row_time.split(':'))
-                    row_datetime = local_tz.localize(datetime(r_year, r_month, r_day, r_hour, r_minute))
-
-                    # Check if event is in the past
-                    if row_datetime < now:
-                        # Get row count BEFORE append
-                        past_count_before = len(self.past_worksheet.get_all_values())
-
-                        # Add entire row to "Otgan tadbirlar" sheet
-                        logger.info(f"Appending to Otgan tadbirlar: {row_title[:30]}...")
-                        result = self.past_worksheet.append_row(row, value_input_option='USER_ENTERED')
-
-                        # Get row count AFTER append to verify it worked
-                        past_all_values = self.past_worksheet.get_all_values()
-                        past_count_after = len(past_all_values)
-
-                        # Verify append was successful
-                        if past_count_after <= past_count_before:
-                            logger.error(f"APPEND FAILED! Row count before: {past_count_before}, after: {past_count_after}")
-                            logger.error(f"Append result was: {result}")
-                            # DO NOT delete the row since append failed
-                            continue
-
-                        new_past_row_num = past_count_after
-                        logger.info(f"Append successful! New row number: {new_past_row_num}")
-
-                        # Apply appropriate background color
-                        if row_title.startswith("[BEKOR QILINDI]"):
-                            # Cancelled past event - RED background
-                            self.past_worksheet.format(f'A{new_past_row_num}:J{new_past_row_num}', {
-                                'backgroundColor': {'red': 1.0, 'green': 0.8, 'blue': 0.8}
-                            })
-                            logger.info(f"Moved cancelled past event '{row_title[:30]}' to Otgan tadbirlar (red)")
-                        else:
-                            # Regular past event - GRAY background
-                            self.past_worksheet.format(f'A{new_past_row_num}:J{new_past_row_num}', {
-                                'backgroundColor': {'red': 0.95, 'green': 0.95, 'blue': 0.95}
-                            })
-                            logger.info(f"Moved past event '{row_title[:30]}' to Otgan tadbirlar (gray)")
-
-                        # Mark row for deletion ONLY if append was successful
-                        rows_to_delete.append(idx)
+                # One repeatCell per contiguous same-color block
+                for first, last in _row_runs(white_rows):
+                    self._queue_row_color(self.worksheet, first, _WHITE, last)
+                for first, last in _row_runs(red_rows):
+                    self._queue_row_color(self.worksheet, first, _RED, last)
 
-                    else:
-                        # Future event - ensure white background (even for cancelled ones)
-                        if row_title.startswith("[BEKOR QILINDI]"):
-                            # Keep cancelled future events with RED background
-                            self.worksheet.format(f'A{idx}:J{idx}', {
-                                'backgroundColor': {'red': 1.0, 'green': 0.8, 'blue': 0.8}
-                            })
-                        else:
-                            # Regular future events - WHITE background
-                            self.worksheet.format(f'A{idx}:J{idx}', {
-                                'backgroundColor': {'red': 1.0, 'green': 1.0, 'blue': 1.0}
-                            })
+                # Delete moved rows from "Tadbirlar" sheet, one request per contiguous block
+                if past_entries:
+                    logger.debug("Deleting %d moved events from Tadbirlar sheet...", len(past_entries))
+                    self._queue_rows_delete([idx for idx, _ in past_entries])
 
-                except Exception as e:
-                    logger.error(f"Error processing row {idx}: {e}")
-                    continue
+            moved = self._batch_result()
 
-            # Delete moved rows from "Tadbirlar" sheet (in reverse order to maintain indices)
-            if rows_to_delete:
-                logger.info(f"Deleting {len(rows_to_delete)} moved events from Tadbirlar sheet...")
-                for row_num in reversed(rows_to_delete):
-                    self.worksheet.delete_rows(row_num)
-                logger.info(f"Successfully moved {len(rows_to_delete)} past events to Otgan tadbirlar")
-            else:
+            if not past_entries:
                 logger.debug("No past events found to move")
+            elif moved:
+                logger.info("Successfully moved %d past events to Otgan tadbirlar", len(past_entries))
+            else:
+                # DO NOT assume anything moved; the next run retries
+                logger.error("Failed to move %d past events to Otgan tadbirlar", len(past_entries))
+
+            # Rows that failed to move must be retried on the next run
+            if not moved:
+                self._next_boundary_crossing = None
+            else:
+                # Earliest start among the rows kept, including any the database
+                # doesn't count as past yet although they already started, so
+                # the next run isn't skipped while they are still here
+                self._next_boundary_crossing = min(
+                    filter(None, (_parse_row_datetime(row[2], row[3]) for _, row in future_entries)),
+                    default=_NO_BOUNDARY
+                )
 
             return True
 
         except Exception as e:
-            logger.error(f"Error in mark_past_events: {e}", exc_info=True)
+            logger.error("Error in mark_past_events: %s", e, exc_info=True)
             return False
 
+    async def _run(self, func, *args):
+        """
+        Run a blocking sheet operation in a worker thread.
+
+        Operations run one at a time and in call order, so the row cache and
+        queued writes are never touched from two threads at once. While a
+        background initialization is running, operations are deferred instead
+        and applied once the connection is ready.
+        """
+        if self._initializing:
+            self._deferred.append((func, args))
+            return True
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            return await asyncio.to_thread(func, *args)
+
+    def _sync_run_batched(self, calls: List[Tuple[Any, tuple]]):
+        """Apply several queued or deferred operations in one batch_update."""
+        with self.batch():
+            # Re-read the sheet up front while nothing is queued, so operations
+            # targeting existing rows don't force the queued writes out early
+            if self._initialized and any(getattr(func, '__name__', '') in _ROW_TARGETING_OPS
+                                         for func, _ in calls):
+                try:
+                    self._refresh_rows()
+                except Exception as e:
+                    logger.error("Error re-reading Tadbirlar before queued writes: %s", e)
+            for func, args in calls:
+                func(*args)
+
+    async def initialize(self):
+        """Initialize connection to Google Sheets."""
+        return await self._run(self._sync_initialize)
+
+    def start_initialize(self) -> asyncio.Task:
+        """
+        Initialize the connection in the background without delaying startup.
+
+        is_connected() reports True meanwhile, so handlers keep calling the
+        write methods; those calls are queued and sent together once ready.
+        """
+        self._initializing = True
+        self._init_task = asyncio.create_task(self._initialize_in_background())
+        return self._init_task
+
+    async def _initialize_in_background(self):
+        """Connect to Google Sheets, then apply everything deferred meanwhile."""
+        try:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                await asyncio.to_thread(self._sync_initialize)
+        finally:
+            # Taken and cleared without awaiting in between, so later calls
+            # can't overtake the deferred ones
+            deferred, self._deferred = self._deferred, []
+            self._initializing = False
+
+        if not self._initialized:
+            logger.warning("Google Sheets not configured or connection failed, "
+                           "dropping %d deferred operations", len(deferred))
+            return
+
+        logger.info("Google Sheets connected successfully")
+        if deferred:
+            await self._run(self._sync_run_batched, deferred)
+            logger.info("Applied %d Google Sheets operations deferred during startup", len(deferred))
+
+    def _submit(self, func, *args):
+        """Queue an operation for the background flusher and return immediately."""
+        if self._submitted is None:
+            self._submitted = asyncio.Queue()
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.create_task(self._flush_submitted())
+        self._submitted.put_nowait((func, args))
+
+    async def _flush_submitted(self):
+        """
+        Apply submitted operations in groups, each group in one batch_update.
+
+        A group is closed after _FLUSH_MAX_OPS operations or _FLUSH_INTERVAL
+        seconds after its first operation arrived, whichever comes first.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            calls = [await self._submitted.get()]
+            deadline = loop.time() + _FLUSH_INTERVAL
+            while len(calls) < _FLUSH_MAX_OPS:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    calls.append(await asyncio.wait_for(self._submitted.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._run(self._sync_run_batched, calls)
+                logger.debug("Applied %d queued Google Sheets operations", len(calls))
+            except Exception as e:
+                logger.error("Error applying %d queued Google Sheets operations: %s",
+                             len(calls), e, exc_info=True)
+            finally:
+                for _ in calls:
+                    self._submitted.task_done()
+
+    async def drain(self):
+        """Wait until every submitted operation has been applied."""
+        if self._submitted is not None and self._flusher_task is not None:
+            await self._submitted.join()
+
+    def queue_add_event(self, event: Dict[str, Any]):
+        """Add an event in the background (see add_event)."""
+        self._submit(self._sync_add_event, event)
+
+    def queue_update_event(self, event_id: int, event: Dict[str, Any]):
+        """Update an event in the background (see update_event)."""
+        self._submit(self._sync_update_event, event_id, event)
+
+    def queue_mark_event_cancelled(self, event_id: int):
+        """Mark an event as cancelled in the background (see mark_event_cancelled)."""
+        self._submit(self._sync_mark_event_cancelled, event_id)
+
+    async def add_event(self, event: Dict[str, Any]) -> bool:
+        """Add a new event to Google Sheets, sorted by date and time."""
+        return await self._run(self._sync_add_event, event)
+
+    async def add_events_bulk(self, events: List[Dict[str, Any]]) -> bool:
+        """Add several events with a single batch_update."""
+        return await self._run(self._sync_add_events_bulk, events)
+
+    async def update_event(self, event_id: int, event: Dict[str, Any]) -> bool:
+        """Update an existing event in Google Sheets."""
+        return await self._run(self._sync_update_event, event_id, event)
+
+    async def delete_event(self, event_id: int) -> bool:
+        """Delete an event from Google Sheets."""
+        return await self._run(self._sync_delete_event, event_id)
+
+    async def mark_event_cancelled(self, event_id: int) -> bool:
+        """Mark an event as cancelled in Google Sheets."""
+        return await self._run(self._sync_mark_event_cancelled, event_id)
+
+    async def mark_past_events(self, past_event_ids=None, known_event_ids=None):
+        """Move all past events from "Tadbirlar" to "Otgan tadbirlar" sheet."""
+        return await self._run(self._sync_mark_past_events, past_event_ids, known_event_ids)
+
 
 # Global Google Sheets manager instance
 sheets_manager = GoogleSheetsManager()
@@ -1,55 +1,62 @@
 """Admin handlers for statistics and management."""
+from typing import Union
 from aiogram import Router, F
+from aiogram.filters import BaseFilter
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from database import db
 from states import DepartmentManagementStates
 import keyboards as kb
 
+
+class AdminFilter(BaseFilter):
+    """Pass only updates coming from admins."""
+
+    async def __call__(self, event: Union[Message, CallbackQuery], user_ctx: dict) -> bool:
+        return user_ctx['is_admin']
+
+
+# Included by the dispatcher; holds the admin-only router and the fallback below
 router = Router()
 
+# Every handler on this router is admin-only; the check runs once per update
+admin_router = Router()
+admin_router.message.filter(AdminFilter())
+admin_router.callback_query.filter(AdminFilter())
 
-@router.message(F.text == "📊 Statistika")
-async def show_statistics(message: Message):
-    """Show event statistics (admin only)."""
-    user_id = message.from_user.id
+# Reached only when the admin filter rejected the update
+denied_router = Router()
+
+router.include_routers(admin_router, denied_router)
 
-    # Check if user is admin
-    if not await db.is_admin(user_id):
-        await message.answer("❌ Bu buyruqdan foydalanish uchun sizda ruxsat yo'q.")
-        return
 
+@admin_router.message(F.text == "📊 Statistika")
+async def show_statistics(message: Message):
+    """Show event statistics (admin only)."""
     # Get statistics
     total_events = await db.get_total_events_count()
     dept_stats = await db.get_event_count_by_department()
 
-    text = "<b>📊 Tadbirlar statistikasi:</b>\n\n"
-    text += f"<b>Jami tadbirlar:</b> {total_events}\n\n"
-    text += "<b>Bo'limlar bo'yicha:</b>\n"
-
-    for stat in dept_stats:
-        text += f"• {stat['department']}: {stat['event_count']} ta\n"
+    text = (
+        "<b>📊 Tadbirlar statistikasi:</b>\n\n"
+        f"<b>Jami tadbirlar:</b> {total_events}\n\n"
+        "<b>Bo'limlar bo'yicha:</b>\n"
+    )
+    text += "".join(f"• {stat['department']}: {stat['event_count']} ta\n" for stat in dept_stats)
 
     await message.answer(text, parse_mode="HTML")
 
 
-@router.message(F.text == "🏢 Bo'limlar boshqaruvi")
+@admin_router.message(F.text == "🏢 Bo'limlar boshqaruvi")
 async def manage_departments(message: Message):
     """Manage departments (admin only)."""
-    user_id = message.from_user.id
-
-    # Check if user is admin
-    if not await db.is_admin(user_id):
-        await message.answer("❌ Bu buyruqdan foydalanish uchun sizda ruxsat yo'q.")
-        return
-
     await message.answer(
         "Bo'limlarni boshqarish:",
         reply_markup=kb.get_departments_management_keyboard()
     )
 
 
-@router.callback_query(F.data == "dept_manage")
+@admin_router.callback_query(F.data == "dept_manage")
 async def dept_manage_callback(callback: CallbackQuery):
     """Show departments management menu."""
     await callback.message.edit_text(
@@ -59,7 +66,7 @@ async def dept_manage_callback(callback: CallbackQuery):
     await callback.answer()
 
 
-@router.callback_query(F.data == "dept_add")
+@admin_router.callback_query(F.data == "dept_add")
 async def start_add_department(callback: CallbackQuery, state: FSMContext):
     """Start adding a new department."""
     await callback.message.edit_text(
@@ -70,7 +77,7 @@ async def start_add_department(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@router.message(DepartmentManagementStates.waiting_for_department_name)
+@admin_router.message(DepartmentManagementStates.waiting_for_department_name)
 async def process_new_department(message: Message, state: FSMContext):
     """Process new department name."""
     dept_name = message.text.strip()
@@ -82,24 +89,22 @@ async def process_new_department(message: Message, state: FSMContext):
     # Add to database
     success = await db.add_department(dept_name)
 
-    user_id = message.from_user.id
-    is_admin = await db.is_admin(user_id)
-
+    # Only admins get here, so the admin menu is shown
     if success:
         await message.answer(
             f"✅ '{dept_name}' bo'limi muvaffaqiyatli qo'shildi!",
-            reply_markup=kb.get_main_menu_keyboard(is_admin)
+            reply_markup=kb.get_main_menu_keyboard(True)
         )
     else:
         await message.answer(
             "❌ Xatolik yuz berdi. Ehtimol bu bo'lim allaqachon mavjud.",
-            reply_markup=kb.get_main_menu_keyboard(is_admin)
+            reply_markup=kb.get_main_menu_keyboard(True)
         )
 
     await state.clear()
 
 
-@router.callback_query(F.data == "dept_list")
+@admin_router.callback_query(F.data == "dept_list")
 async def show_departments_list(callback: CallbackQuery):
     """Show list of departments for deletion."""
     departments = await db.get_all_departments()
@@ -117,20 +122,16 @@ async def show_departments_list(callback: CallbackQuery):
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("dept_delete:"))
+@admin_router.callback_query(F.data.startswith("dept_delete:"))
 async def delete_department(callback: CallbackQuery):
     """Delete a department safely using its ID."""
     # Extract the department ID from callback_data
     dep_id = int(callback.data.split(":")[1])
 
-    # Get the full department info from DB
-    dep = await db.get_department_by_id(dep_id)
-    dep_name = dep["name"]
-
-    # Delete department by ID
-    success = await db.delete_department_by_id(dep_id)
+    # Delete department by ID; its name comes back from the same query
+    dep_name = await db.delete_department_returning(dep_id)
 
-    if success:
+    if dep_name:
         await callback.answer(f"✅ '{dep_name}' o'chirildi", show_alert=True)
 
         # Refresh list
@@ -150,3 +151,8 @@ async def delete_department(callback: CallbackQuery):
     else:
         await callback.answer("❌ Xatolik yuz berdi", show_alert=True)
 
+
+@denied_router.message(F.text.in_({"📊 Statistika", "🏢 Bo'limlar boshqaruvi"}))
+async def admin_command_denied(message: Message):
+    """Tell non-admins they can't use admin menu buttons."""
+    await message.answer("❌ Bu buyruqdan foydalanish uchun sizda ruxsat yo'q.")
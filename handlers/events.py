@@ -1,20 +1,220 @@
 """Event management handlers."""
 from aiogram import Router, F
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, CallbackQuery
-from datetime import datetime, timedelta
+from datetime import date, timedelta
+from functools import lru_cache
+from operator import itemgetter
 from database import db
 from states import AddEventStates, EditEventStates
 import keyboards as kb
 from google_sheets import sheets_manager
+from scheduler import EventFields
 import config
-import re
+import asyncio
+import logging
+import time
 
 router = Router()
 
+logger = logging.getLogger(__name__)
+
+
+# Message templates, filled with str.format_map() from event/state dicts
+_EVENT_TEXT_TMPL = (
+    "<b>{title}</b>\n"
+    "📅 {date} – {time}\n"
+    "📍 {place}\n"
+    "💬 Izoh: {comment}"
+)
+_CREATOR_TMPL = (
+    "👤 Mas'ul: {creator_name}\n"
+    "🏢 Bo'lim: {creator_department}\n"
+    "📱 Telefon: {creator_phone}"
+)
+_EVENT_DETAIL_TMPL = _EVENT_TEXT_TMPL + "\n\n" + _CREATOR_TMPL
+_EVENT_FIELDS_TMPL = (
+    "📅 Sana: {date}\n"
+    "🕐 Vaqt: {time}\n"
+    "📍 Joy: {place}\n"
+    "💬 Izoh: {comment}\n\n"
+)
+_CONFIRMATION_TMPL = (
+    "📋 <b>Tadbir ma'lumotlarini tasdiqlang:</b>\n\n"
+    "<b>Nomi:</b> {title}\n"
+    "<b>Sana:</b> {date}\n"
+    "<b>Vaqt:</b> {time}\n"
+    "<b>Joy:</b> {place}\n"
+    "<b>Izoh:</b> {comment}\n\n"
+    "Tasdiqlaysizmi?"
+)
+_CANCELLED_TMPL = (
+    "❌ <b>Tadbir bekor qilindi!</b>\n\n"
+    "<b>{title}</b>\n\n"
+    + _EVENT_FIELDS_TMPL + _CREATOR_TMPL
+)
+_EDITED_TMPL = (
+    "✏️ <b>Tadbir tahrirlandi!</b>\n\n"
+    "<b>{title}</b>\n\n"
+    "O'zgargan maydon: {changed_field}\n"
+    "Yangi qiymat: {new_value}\n\n"
+    + _EVENT_FIELDS_TMPL + _CREATOR_TMPL
+)
+
+# Event fields collected by the add-event flow, read from FSM data in one call
+_EVENT_FIELDS = itemgetter('title', 'date', 'time', 'place', 'comment')
+
+# Replies for each _check_event_date/_check_event_time failure, in the add
+# flow and when editing a field
+_ADD_DATE_ERRORS = {
+    "format": "❌ Noto'g'ri format. Iltimos, sanani DD.MM.YYYY formatida kiriting (masalan: 25.12.2024):",
+    "invalid": "❌ Noto'g'ri sana. Iltimos, to'g'ri sanani kiriting (masalan: 25.12.2024):",
+    "past": "❌ Tadbir sanasi o'tmishda bo'lishi mumkin emas. Iltimos, bugungi yoki kelajakdagi sanani kiriting:",
+}
+_EDIT_DATE_ERRORS = {
+    "format": "❌ Noto'g'ri format. Iltimos, sanani DD.MM.YYYY formatida kiriting:",
+    "invalid": "❌ Noto'g'ri sana. Iltimos, to'g'ri sanani kiriting:",
+    "past": "❌ Tadbir sanasi o'tmishda bo'lishi mumkin emas:",
+}
+_ADD_TIME_ERRORS = {
+    "format": "❌ Noto'g'ri format. Iltimos, vaqtni HH:MM formatida kiriting (masalan: 14:30):",
+    "invalid": "❌ Noto'g'ri vaqt. Iltimos, to'g'ri vaqtni kiriting (masalan: 14:30):",
+}
+_EDIT_TIME_ERRORS = {
+    "format": "❌ Noto'g'ri format. Iltimos, vaqtni HH:MM formatida kiriting:",
+    "invalid": "❌ Noto'g'ri vaqt. Iltimos, to'g'ri vaqtni kiriting:",
+}
+
+# Callback data prefixes; the id or field name follows the prefix
+_VIEW, _CANCEL, _EDIT, _FIELD = "view_event_", "cancel_event_", "edit_event_", "edit_field_"
+_PAGE = "my_events_page_"
+
+# Field names shown in edit notifications
+_FIELD_NAMES_UZ = {
+    "title": "Tadbir nomi",
+    "date": "Sana",
+    "time": "Vaqt",
+    "place": "Joy",
+    "comment": "Izoh"
+}
+
+
 # Global scheduler instance (set by bot.py at startup)
 reminder_scheduler = None
 
+# How long a user's "my events" list is reused between views (seconds)
+USER_EVENTS_CACHE_TTL = 5
+
+# telegram_id -> (expires_at, upcoming events, their list keyboard) for the
+# "my events" views; changed by the user's own add/edit/cancel, which update
+# or drop the entry
+_user_events_cache = {}
+
+# Media group notifications still being sent; referenced here so the tasks
+# aren't garbage-collected before they finish
+_notification_tasks = set()
+
+
+async def _get_user_events(user_id: int):
+    """
+    User's upcoming events and their list keyboard.
+
+    Both are reused for USER_EVENTS_CACHE_TTL seconds.
+
+    Returns:
+        Tuple (events, keyboard)
+    """
+    cached = _user_events_cache.get(user_id)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1], cached[2]
+
+    events = await db.get_events_by_user(user_id)  # upcoming_only=True by default
+    keyboard = kb.get_my_events_keyboard(events)
+
+    # Drop expired lists on each refill, so only recently active users are kept
+    now = time.monotonic()
+    for expired in [uid for uid, entry in _user_events_cache.items() if entry[0] <= now]:
+        del _user_events_cache[expired]
+    _user_events_cache[user_id] = (now + USER_EVENTS_CACHE_TTL, events, keyboard)
+    return events, keyboard
+
+
+def _drop_user_event(user_id: int, event_id: int):
+    """Remove a cancelled event from the user's cached list without re-querying."""
+    cached = _user_events_cache.get(user_id)
+    if cached is not None:
+        events = [e for e in cached[1] if e['id'] != event_id]
+        _user_events_cache[user_id] = (cached[0], events, kb.get_my_events_keyboard(events))
+
+
+def _invalidate_user_events(user_id: int):
+    """Forget the user's cached event list after they add or edit an event."""
+    _user_events_cache.pop(user_id, None)
+
+
+def _notify_in_background(send, description: str):
+    """Send a media group notification without making the handler wait for it."""
+    async def run():
+        try:
+            await send
+        except Exception as e:
+            logger.exception("Error sending %s: %s", description, e)
+
+    task = asyncio.create_task(run())
+    _notification_tasks.add(task)
+    task.add_done_callback(_notification_tasks.discard)
+
+
+def _post_event_side_effects(kind: str, event: dict, **extra):
+    """
+    Queue the Google Sheets write, the event's reminders and the media group
+    notification for an event.
+
+    The write and the notification run in the background, so the handler can
+    reply right away.
+
+    Args:
+        kind: "added", "edited" or "cancelled"
+        event: Event dictionary with creator info (as db.get_event())
+        extra: Template values for "edited" (changed_field, new_value)
+    """
+    if sheets_manager.is_connected():
+        if kind == "added":
+            sheets_manager.queue_add_event(event)
+        elif kind == "edited":
+            sheets_manager.queue_update_event(event['id'], event)
+        else:
+            sheets_manager.queue_mark_event_cancelled(event['id'])
+
+    if not reminder_scheduler:
+        logger.debug("Skipping %s notification: reminder scheduler not set", kind)
+        return
+
+    if kind == "cancelled":
+        reminder_scheduler.unschedule_event(event['id'])
+    else:
+        reminder_scheduler.schedule_event(event, edited=kind == "edited")
+
+    if kind == "added":
+        _notify_in_background(reminder_scheduler.send_immediate_notification(event), "notification")
+        return
+
+    if not config.MEDIA_GROUP_CHAT_ID:
+        logger.error("MEDIA_GROUP_CHAT_ID not configured in .env file")
+        return
+
+    template = _EDITED_TMPL if kind == "edited" else _CANCELLED_TMPL
+    _notify_in_background(
+        _send_event_message(reminder_scheduler, template, event, extra),
+        f"{kind} notification"
+    )
+
+
+async def _send_event_message(scheduler, template: str, event: dict, extra: dict):
+    """Render an event template and send it to the media group (background task)."""
+    await scheduler.send_to_group(template.format_map(EventFields(event, **extra)))
+
 
 # ========== ADD EVENT HANDLERS ==========
 
@@ -30,15 +230,13 @@ async def start_add_event(message: Message, state: FSMContext):
 
 
 @router.message(AddEventStates.waiting_for_title, F.text == "❌ Bekor qilish")
-async def cancel_add_event(message: Message, state: FSMContext):
+async def cancel_add_event(message: Message, state: FSMContext, user_ctx: dict):
     """Cancel adding event."""
     await state.clear()
-    user_id = message.from_user.id
-    is_admin = await db.is_admin(user_id)
 
     await message.answer(
         "Tadbir qo'shish bekor qilindi.",
-        reply_markup=kb.get_main_menu_keyboard(is_admin)
+        reply_markup=kb.get_main_menu_keyboard(user_ctx['is_admin'])
     )
 
 
@@ -61,9 +259,9 @@ async def process_event_title(message: Message, state: FSMContext):
 
 
 @router.message(AddEventStates.waiting_for_date, F.text == "❌ Bekor qilish")
-async def cancel_at_date(message: Message, state: FSMContext):
+async def cancel_at_date(message: Message, state: FSMContext, user_ctx: dict):
     """Cancel at date step."""
-    await cancel_add_event(message, state)
+    await cancel_add_event(message, state, user_ctx)
 
 
 @router.message(AddEventStates.waiting_for_date)
@@ -71,33 +269,13 @@ async def process_event_date(message: Message, state: FSMContext):
     """Process event date."""
     date_text = message.text.strip()
 
-    # Validate date format
-    if not re.match(r'^\d{2}\.\d{2}\.\d{4}$', date_text):
-        await message.answer(
-            "❌ Noto'g'ri format. Iltimos, sanani DD.MM.YYYY formatida kiriting (masalan: 25.12.2024):"
-        )
-        return
-
-    # Parse and validate date
-    try:
-        day, month, year = map(int, date_text.split('.'))
-        event_date = datetime(year, month, day)
-
-        # Check if date is not in the past
-        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        if event_date < today:
-            await message.answer(
-                "❌ Tadbir sanasi o'tmishda bo'lishi mumkin emas. Iltimos, bugungi yoki kelajakdagi sanani kiriting:"
-            )
-            return
-
-    except ValueError:
-        await message.answer(
-            "❌ Noto'g'ri sana. Iltimos, to'g'ri sanani kiriting (masalan: 25.12.2024):"
-        )
+    event_date, error = _check_event_date(date_text)
+    if error:
+        await message.answer(_ADD_DATE_ERRORS[error])
         return
 
-    await state.update_data(date=date_text)
+    # Keep the parsed form too, so later steps don't parse the text again
+    await state.update_data(date=date_text, date_parsed=event_date.isoformat())
     await message.answer(
         "Yaxshi! Endi tadbir vaqtini kiriting.\n\n"
         "Format: HH:MM (24 soatlik, masalan: 14:30)",
@@ -107,9 +285,9 @@ async def process_event_date(message: Message, state: FSMContext):
 
 
 @router.message(AddEventStates.waiting_for_time, F.text == "❌ Bekor qilish")
-async def cancel_at_time(message: Message, state: FSMContext):
+async def cancel_at_time(message: Message, state: FSMContext, user_ctx: dict):
     """Cancel at time step."""
-    await cancel_add_event(message, state)
+    await cancel_add_event(message, state, user_ctx)
 
 
 @router.message(AddEventStates.waiting_for_time)
@@ -117,23 +295,9 @@ async def process_event_time(message: Message, state: FSMContext):
     """Process event time."""
     time_text = message.text.strip()
 
-    # Validate time format
-    if not re.match(r'^\d{2}:\d{2}$', time_text):
-        await message.answer(
-            "❌ Noto'g'ri format. Iltimos, vaqtni HH:MM formatida kiriting (masalan: 14:30):"
-        )
-        return
-
-    # Parse and validate time
-    try:
-        hour, minute = map(int, time_text.split(':'))
-        if not (0 <= hour <= 23 and 0 <= minute <= 59):
-            raise ValueError
-
-    except ValueError:
-        await message.answer(
-            "❌ Noto'g'ri vaqt. Iltimos, to'g'ri vaqtni kiriting (masalan: 14:30):"
-        )
+    error = _check_event_time(time_text)[1]
+    if error:
+        await message.answer(_ADD_TIME_ERRORS[error])
         return
 
     await state.update_data(time=time_text)
@@ -145,9 +309,9 @@ async def process_event_time(message: Message, state: FSMContext):
 
 
 @router.message(AddEventStates.waiting_for_place, F.text == "❌ Bekor qilish")
-async def cancel_at_place(message: Message, state: FSMContext):
+async def cancel_at_place(message: Message, state: FSMContext, user_ctx: dict):
     """Cancel at place step."""
-    await cancel_add_event(message, state)
+    await cancel_add_event(message, state, user_ctx)
 
 
 @router.message(AddEventStates.waiting_for_place)
@@ -171,37 +335,28 @@ async def process_event_place(message: Message, state: FSMContext):
 @router.message(AddEventStates.waiting_for_comment, F.text == "⏭ O'tkazib yuborish")
 async def skip_comment(message: Message, state: FSMContext):
     """Skip comment and show confirmation."""
-    await state.update_data(comment="Izoh yo'q")
-    await show_event_confirmation(message, state)
+    await show_event_confirmation(message, state, "Izoh yo'q")
 
 
 @router.message(AddEventStates.waiting_for_comment, F.text == "❌ Bekor qilish")
-async def cancel_at_comment(message: Message, state: FSMContext):
+async def cancel_at_comment(message: Message, state: FSMContext, user_ctx: dict):
     """Cancel at comment step."""
-    await cancel_add_event(message, state)
+    await cancel_add_event(message, state, user_ctx)
 
 
 @router.message(AddEventStates.waiting_for_comment)
 async def process_event_comment(message: Message, state: FSMContext):
     """Process event comment."""
     comment = message.text.strip()
-    await state.update_data(comment=comment)
-    await show_event_confirmation(message, state)
+    await show_event_confirmation(message, state, comment)
 
 
-async def show_event_confirmation(message: Message, state: FSMContext):
-    """Show event confirmation."""
-    data = await state.get_data()
+async def show_event_confirmation(message: Message, state: FSMContext, comment: str):
+    """Store the comment and show event confirmation."""
+    # update_data returns the merged data, so no separate get_data is needed
+    data = await state.update_data(comment=comment)
 
-    confirmation_text = (
-        "📋 <b>Tadbir ma'lumotlarini tasdiqlang:</b>\n\n"
-        f"<b>Nomi:</b> {data['title']}\n"
-        f"<b>Sana:</b> {data['date']}\n"
-        f"<b>Vaqt:</b> {data['time']}\n"
-        f"<b>Joy:</b> {data['place']}\n"
-        f"<b>Izoh:</b> {data['comment']}\n\n"
-        "Tasdiqlaysizmi?"
-    )
+    confirmation_text = _CONFIRMATION_TMPL.format_map(data)
 
     await message.answer(
         confirmation_text,
@@ -212,49 +367,47 @@ async def show_event_confirmation(message: Message, state: FSMContext):
 
 
 @router.callback_query(AddEventStates.waiting_for_confirmation, F.data == "confirm_yes")
-async def confirm_add_event(callback: CallbackQuery, state: FSMContext):
+async def confirm_add_event(callback: CallbackQuery, state: FSMContext, user_ctx: dict):
     """Confirm and add event."""
+    # Dismiss the button spinner before the database work
+    await callback.answer()
     data = await state.get_data()
     user_id = callback.from_user.id
 
-    # Add event to database
-    event_id = await db.add_event(
-        title=data['title'],
-        date=data['date'],
-        time=data['time'],
-        place=data['place'],
-        comment=data['comment'],
-        created_by_user_id=user_id
-    )
-
-    if event_id:
-        # Get full event data with user info
-        event = await db.get_event(event_id)
-
-        # Add to Google Sheets
-        if sheets_manager.is_connected():
-            sheets_manager.add_event(event)
-
-        # Send notification to media group
-        if reminder_scheduler:
-            try:
-                await reminder_scheduler.send_immediate_notification(event)
-            except Exception as e:
-                print(f"❌ Error sending notification: {e}")
-                import traceback
-                traceback.print_exc()
-
-        is_admin = await db.is_admin(user_id)
-
+    try:
+        title, date, time_text, place, comment = _EVENT_FIELDS(data)
+    except KeyError as e:
+        # FSM data lost (e.g. bot restarted mid-flow)
+        logger.warning("Missing FSM field %s when confirming event for user %s", e, user_id)
+        await state.clear()
         await callback.message.edit_text(
-            "✅ Tadbir muvaffaqiyatli qo'shildi!\n\n"
-            "Media guruhiga xabar yuborildi.",
+            "❌ Tadbir ma'lumotlari topilmadi. Iltimos, qaytadan boshlang.",
             reply_markup=None
         )
+        return
 
-        await callback.message.answer(
-            "Asosiy menyu:",
-            reply_markup=kb.get_main_menu_keyboard(is_admin)
+    # Add event to database (returned with creator info)
+    event = await db.add_event_returning(
+        title, date, time_text, place, comment, user_id,
+        event_date=data.get('date_parsed')
+    )
+
+    if event:
+        _invalidate_user_events(user_id)
+
+        _post_event_side_effects("added", event)
+
+        # Independent requests: send them concurrently
+        await asyncio.gather(
+            callback.message.edit_text(
+                "✅ Tadbir muvaffaqiyatli qo'shildi!\n\n"
+                "Media guruhiga xabar yuborildi.",
+                reply_markup=None
+            ),
+            callback.message.answer(
+                "Asosiy menyu:",
+                reply_markup=kb.get_main_menu_keyboard(user_ctx['is_admin'])
+            )
         )
     else:
         await callback.message.edit_text(
@@ -263,28 +416,25 @@ async def confirm_add_event(callback: CallbackQuery, state: FSMContext):
         )
 
     await state.clear()
-    await callback.answer()
 
 
 @router.callback_query(AddEventStates.waiting_for_confirmation, F.data == "confirm_no")
-async def cancel_confirmation(callback: CallbackQuery, state: FSMContext):
+async def cancel_confirmation(callback: CallbackQuery, state: FSMContext, user_ctx: dict):
     """Cancel event confirmation."""
+    await callback.answer()
     await state.clear()
-    user_id = callback.from_user.id
-    is_admin = await db.is_admin(user_id)
-
-    await callback.message.edit_text(
-        "❌ Tadbir qo'shish bekor qilindi.",
-        reply_markup=None
-    )
 
-    await callback.message.answer(
-        "Asosiy menyu:",
-        reply_markup=kb.get_main_menu_keyboard(is_admin)
+    await asyncio.gather(
+        callback.message.edit_text(
+            "❌ Tadbir qo'shish bekor qilindi.",
+            reply_markup=None
+        ),
+        callback.message.answer(
+            "Asosiy menyu:",
+            reply_markup=kb.get_main_menu_keyboard(user_ctx['is_admin'])
+        )
     )
 
-    await callback.answer()
-
 
 # ========== VIEW EVENTS HANDLERS ==========
 
@@ -304,16 +454,13 @@ async def show_today_events(message: Message):
 
     Filter: event date == today's date (bugun 00:00 - 23:59)
     """
-    today = datetime.now().strftime('%d.%m.%Y')
-    events = await db.get_events_by_date(today)
+    events = await db.get_events_by_date(date.today())
 
     if not events:
         await message.answer("Bugun tadbirlar yo'q")
         return
 
-    text = "<b>📆 Bugungi tadbirlar:</b>\n\n"
-    for event in events:
-        text += format_event_text(event) + "\n\n"
+    text = format_events_list("<b>📆 Bugungi tadbirlar:</b>\n\n", events)
 
     await message.answer(text, parse_mode="HTML")
 
@@ -325,26 +472,16 @@ async def show_week_events(message: Message):
 
     Filter: event_date in [today ... end of week (Sunday)]
     """
-    today = datetime.now()
-
-    # Calculate days until Sunday (0=Monday, 6=Sunday)
-    days_until_sunday = 6 - today.weekday()
-    end_of_week = today + timedelta(days=days_until_sunday)
-
-    # Format dates for date range query
-    start_date = today.strftime('%d.%m.%Y')
-    end_date = end_of_week.strftime('%d.%m.%Y')
+    start, end_of_week = _week_bounds(date.today().toordinal())
 
     # Get events from today until end of week
-    events = await db.get_events_by_date_range(start_date, end_date)
+    events = await db.get_events_by_date_range(start, end_of_week)
 
     if not events:
         await message.answer("Ushbu haftada tadbirlar yo'q")
         return
 
-    text = "<b>📅 Haftalik jadval (bugundan yakshanba oxirigacha):</b>\n\n"
-    for event in events:
-        text += format_event_text(event) + "\n\n"
+    text = format_events_list("<b>📅 Haftalik jadval (bugundan yakshanba oxirigacha):</b>\n\n", events)
 
     await message.answer(text, parse_mode="HTML")
 
@@ -356,31 +493,16 @@ async def show_monthly_events(message: Message):
 
     Filter: event_date in [today ... end of current month]
     """
-    today = datetime.now()
-
-    # Calculate last day of current month
-    if today.month == 12:
-        # December - end is Dec 31
-        end_of_month = datetime(today.year, 12, 31)
-    else:
-        # Get first day of next month, then subtract 1 day
-        first_of_next_month = datetime(today.year, today.month + 1, 1)
-        end_of_month = first_of_next_month - timedelta(days=1)
-
-    # Format dates for date range query
-    start_date = today.strftime('%d.%m.%Y')
-    end_date = end_of_month.strftime('%d.%m.%Y')
+    start, end_of_month = _month_bounds(date.today().toordinal())
 
     # Get events from today until end of month
-    events = await db.get_events_by_date_range(start_date, end_date)
+    events = await db.get_events_by_date_range(start, end_of_month)
 
     if not events:
         await message.answer("Ushbu oyda tadbirlar yo'q")
         return
 
-    text = "<b>📊 Oylik jadval (bugundan oy oxirigacha):</b>\n\n"
-    for event in events:
-        text += format_event_text(event) + "\n\n"
+    text = format_events_list("<b>📊 Oylik jadval (bugundan oy oxirigacha):</b>\n\n", events)
 
     # Show count if many events
     if len(events) > 20:
@@ -390,14 +512,11 @@ async def show_monthly_events(message: Message):
 
 
 @router.message(F.text == "🔙 Asosiy menyu")
-async def back_to_main_menu_from_schedule(message: Message):
+async def back_to_main_menu_from_schedule(message: Message, user_ctx: dict):
     """Back to main menu from schedule."""
-    user_id = message.from_user.id
-    is_admin = await db.is_admin(user_id)
-
     await message.answer(
         "Asosiy menyu:",
-        reply_markup=kb.get_main_menu_keyboard(is_admin)
+        reply_markup=kb.get_main_menu_keyboard(user_ctx['is_admin'])
     )
 
 
@@ -413,7 +532,9 @@ async def show_my_events(message: Message):
     - Only events with datetime > now (upcoming events)
     """
     user_id = message.from_user.id
-    events = await db.get_events_by_user(user_id)  # upcoming_only=True by default
+    # A fresh list for the menu entry point; the callbacks below reuse it
+    _invalidate_user_events(user_id)
+    events, keyboard = await _get_user_events(user_id)
 
     if not events:
         await message.answer("Sizda hali tadbirlar yo'q.")
@@ -421,14 +542,14 @@ async def show_my_events(message: Message):
 
     await message.answer(
         "Sizning tadbirlaringiz:",
-        reply_markup=kb.get_my_events_keyboard(events)
+        reply_markup=keyboard
     )
 
 
-@router.callback_query(F.data.startswith("view_event_"))
+@router.callback_query(F.data.startswith(_VIEW))
 async def view_event_detail(callback: CallbackQuery):
     """View event details."""
-    event_id = int(callback.data.split("_")[2])
+    event_id = int(callback.data[len(_VIEW):])
     event = await db.get_event(event_id)
 
     if not event:
@@ -452,19 +573,39 @@ async def view_event_detail(callback: CallbackQuery):
 async def back_to_my_events(callback: CallbackQuery):
     """Back to my events list."""
     user_id = callback.from_user.id
-    events = await db.get_events_by_user(user_id)
+    _, keyboard = await _get_user_events(user_id)
 
     await callback.message.edit_text(
         "Sizning tadbirlaringiz:",
-        reply_markup=kb.get_my_events_keyboard(events)
+        reply_markup=keyboard
     )
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("cancel_event_"))
+@router.callback_query(F.data.startswith(_PAGE))
+async def show_my_events_page(callback: CallbackQuery):
+    """Switch the my events list to another page."""
+    page = int(callback.data[len(_PAGE):])
+    events, keyboard = await _get_user_events(callback.from_user.id)
+
+    # The cached keyboard is the first page; others are built from the cached list
+    if page:
+        keyboard = kb.get_my_events_keyboard(events, page)
+
+    try:
+        await callback.message.edit_reply_markup(reply_markup=keyboard)
+    except TelegramBadRequest as e:
+        # The list shrank and the clamped page is the one already shown
+        if "message is not modified" not in e.message:
+            raise
+    finally:
+        await callback.answer()
+
+
+@router.callback_query(F.data.startswith(_CANCEL))
 async def cancel_event(callback: CallbackQuery):
     """Cancel an event."""
-    event_id = int(callback.data.split("_")[2])
+    event_id = int(callback.data[len(_CANCEL):])
     event = await db.get_event(event_id)
 
     if not event:
@@ -480,32 +621,9 @@ async def cancel_event(callback: CallbackQuery):
     success = await db.cancel_event(event_id)
 
     if success:
-        # Update Google Sheets
-        if sheets_manager.is_connected():
-            sheets_manager.mark_event_cancelled(event_id)
-
-        # Send cancellation notification to media group
-        if reminder_scheduler and config.MEDIA_GROUP_CHAT_ID:
-            try:
-                cancellation_msg = (
-                    f"❌ <b>Tadbir bekor qilindi!</b>\n\n"
-                    f"<b>{event['title']}</b>\n\n"
-                    f"📅 Sana: {event['date']}\n"
-                    f"🕐 Vaqt: {event['time']}\n"
-                    f"📍 Joy: {event['place']}\n"
-                    f"💬 Izoh: {event.get('comment', 'Izoh yoʼq')}\n\n"
-                    f"👤 Mas'ul: {event['creator_name']}\n"
-                    f"🏢 Bo'lim: {event['creator_department']}\n"
-                    f"📱 Telefon: {event['creator_phone']}"
-                )
-
-                await reminder_scheduler.bot.send_message(
-                    chat_id=config.MEDIA_GROUP_CHAT_ID,
-                    text=cancellation_msg,
-                    parse_mode="HTML"
-                )
-            except Exception as e:
-                print(f"❌ Error sending cancellation notification: {e}")
+        _drop_user_event(callback.from_user.id, event_id)
+
+        _post_event_side_effects("cancelled", event)
 
         await callback.answer("Tadbir bekor qilindi", show_alert=True)
         await back_to_my_events(callback)
@@ -515,10 +633,10 @@ async def cancel_event(callback: CallbackQuery):
 
 # ========== EDIT EVENT HANDLERS ==========
 
-@router.callback_query(F.data.startswith("edit_event_"))
+@router.callback_query(F.data.startswith(_EDIT))
 async def start_edit_event(callback: CallbackQuery, state: FSMContext):
     """Start editing an event."""
-    event_id = int(callback.data.split("_")[2])
+    event_id = int(callback.data[len(_EDIT):])
     event = await db.get_event(event_id)
 
     if not event:
@@ -544,10 +662,10 @@ async def start_edit_event(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@router.callback_query(EditEventStates.selecting_field, F.data.startswith("edit_field_"))
+@router.callback_query(EditEventStates.selecting_field, F.data.startswith(_FIELD))
 async def select_field_to_edit(callback: CallbackQuery, state: FSMContext):
     """Select which field to edit."""
-    field = callback.data.split("_")[2]
+    field = callback.data[len(_FIELD):]
     await state.update_data(editing_field=field)
 
     field_names = {
@@ -589,117 +707,33 @@ async def back_to_event_from_edit(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(EditEventStates.waiting_for_new_value)
-async def process_new_field_value(message: Message, state: FSMContext):
+async def process_new_field_value(message: Message, state: FSMContext, user_ctx: dict):
     """Process the new value for the field."""
     data = await state.get_data()
     field = data.get('editing_field')
     event_id = data.get('editing_event_id')
     new_value = message.text.strip()
 
-    # Validate based on field type
-    if field == "date":
-        if not re.match(r'^\d{2}\.\d{2}\.\d{4}$', new_value):
-            await message.answer(
-                "❌ Noto'g'ri format. Iltimos, sanani DD.MM.YYYY formatida kiriting:"
-            )
-            return
-
-        try:
-            day, month, year = map(int, new_value.split('.'))
-            event_date = datetime(year, month, day)
-            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            if event_date < today:
-                await message.answer("❌ Tadbir sanasi o'tmishda bo'lishi mumkin emas:")
-                return
-        except ValueError:
-            await message.answer("❌ Noto'g'ri sana. Iltimos, to'g'ri sanani kiriting:")
-            return
-
-    elif field == "time":
-        if not re.match(r'^\d{2}:\d{2}$', new_value):
-            await message.answer(
-                "❌ Noto'g'ri format. Iltimos, vaqtni HH:MM formatida kiriting:"
-            )
-            return
-
-        try:
-            hour, minute = map(int, new_value.split(':'))
-            if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                raise ValueError
-        except ValueError:
-            await message.answer("❌ Noto'g'ri vaqt. Iltimos, to'g'ri vaqtni kiriting:")
-            return
-
-    elif field == "title" and len(new_value) < 3:
-        await message.answer("Tadbir nomi juda qisqa. Kamida 3 ta belgidan iborat bo'lishi kerak:")
+    # Validate with the field's rule
+    error = _FIELD_VALIDATORS.get(field, _no_validation)(new_value)
+    if error:
+        await message.answer(error)
         return
 
-    elif field == "place" and len(new_value) < 2:
-        await message.answer("Joy nomi juda qisqa:")
-        return
-
-    # Update in database
-    success = await db.update_event(event_id, **{field: new_value})
+    # Update in database and get the updated event back in one query
+    event = await db.update_event_returning(event_id, **{field: new_value})
 
-    if success:
-        # Get updated event
-        event = await db.get_event(event_id)
-        print(f"🔍 DEBUG: event = {event is not None}, reminder_scheduler = {reminder_scheduler is not None}")
-
-        # Update in Google Sheets
-        if event and sheets_manager.is_connected():
-            sheets_manager.update_event(event_id, event)
-
-        # Send notification to media group
-        if event and reminder_scheduler:
-            print(f"🔍 DEBUG: Attempting to send edit notification...")
-            try:
-                if not config.MEDIA_GROUP_CHAT_ID:
-                    print("❌ Error: MEDIA_GROUP_CHAT_ID not configured in .env file")
-                else:
-                    print(f"📤 Sending edit notification to chat_id: {config.MEDIA_GROUP_CHAT_ID}")
-
-                    field_names_uz = {
-                        "title": "Tadbir nomi",
-                        "date": "Sana",
-                        "time": "Vaqt",
-                        "place": "Joy",
-                        "comment": "Izoh"
-                    }
-
-                    notification_msg = (
-                        f"✏️ <b>Tadbir tahrirlandi!</b>\n\n"
-                        f"<b>{event['title']}</b>\n\n"
-                        f"O'zgargan maydon: {field_names_uz.get(field, field)}\n"
-                        f"Yangi qiymat: {new_value}\n\n"
-                        f"📅 Sana: {event['date']}\n"
-                        f"🕐 Vaqt: {event['time']}\n"
-                        f"📍 Joy: {event['place']}\n"
-                        f"💬 Izoh: {event.get('comment', '')}\n\n"
-                        f"👤 Mas'ul: {event['creator_name']}\n"
-                        f"🏢 Bo'lim: {event['creator_department']}\n"
-                        f"📱 Telefon: {event['creator_phone']}"
-                    )
-
-                    await reminder_scheduler.bot.send_message(
-                        chat_id=config.MEDIA_GROUP_CHAT_ID,
-                        text=notification_msg,
-                        parse_mode="HTML"
-                    )
-                    print(f"✅ Edit notification sent for event {event['id']}")
-            except Exception as e:
-                print(f"❌ Error sending edit notification: {e}")
-                import traceback
-                traceback.print_exc()
-        else:
-            print(f"🔍 DEBUG: Skipping notification - event={event is not None}, reminder_scheduler={reminder_scheduler is not None}")
-
-        user_id = message.from_user.id
-        is_admin = await db.is_admin(user_id)
+    if event:
+        _invalidate_user_events(message.from_user.id)
+        _post_event_side_effects(
+            "edited", event,
+            changed_field=_FIELD_NAMES_UZ.get(field, field),
+            new_value=new_value
+        )
 
         await message.answer(
             "✅ Tadbir muvaffaqiyatli yangilandi!",
-            reply_markup=kb.get_main_menu_keyboard(is_admin)
+            reply_markup=kb.get_main_menu_keyboard(user_ctx['is_admin'])
         )
     else:
         await message.answer("❌ Xatolik yuz berdi. Qaytadan urinib ko'ring.")
@@ -707,21 +741,113 @@ async def process_new_field_value(message: Message, state: FSMContext):
     await state.clear()
 
 
+def _parse_ddmmyyyy(text: str):
+    """Split a DD.MM.YYYY string into (day, month, year), or None if it isn't in that format."""
+    if (len(text) == 10 and text[2] == '.' and text[5] == '.'
+            and text[:2].isdecimal() and text[3:5].isdecimal() and text[6:].isdecimal()):
+        return int(text[:2]), int(text[3:5]), int(text[6:])
+    return None
+
+
+def _parse_hhmm(text: str):
+    """Split an HH:MM string into (hour, minute), or None if it isn't in that format."""
+    if len(text) == 5 and text[2] == ':' and text[:2].isdecimal() and text[3:].isdecimal():
+        return int(text[:2]), int(text[3:])
+    return None
+
+
+@lru_cache(maxsize=1)
+def _week_bounds(day_ord: int):
+    """(today, Sunday of this week) for the given date ordinal, cached for the day."""
+    today = date.fromordinal(day_ord)
+    # 0=Monday, 6=Sunday
+    return today, today + timedelta(days=6 - today.weekday())
+
+
+@lru_cache(maxsize=1)
+def _month_bounds(day_ord: int):
+    """(today, last day of this month) for the given date ordinal, cached for the day."""
+    today = date.fromordinal(day_ord)
+    if today.month == 12:
+        # December - end is Dec 31
+        return today, date(today.year, 12, 31)
+    # First day of next month, minus 1 day
+    return today, date(today.year, today.month + 1, 1) - timedelta(days=1)
+
+
+def _check_event_date(text: str):
+    """
+    Parse a DD.MM.YYYY event date.
+
+    Returns:
+        (date, None), or (None, reason) with reason "format", "invalid" or "past"
+    """
+    date_parts = _parse_ddmmyyyy(text)
+    if not date_parts:
+        return None, "format"
+
+    day, month, year = date_parts
+    try:
+        event_date = date(year, month, day)
+    except ValueError:
+        return None, "invalid"
+
+    if event_date < date.today():
+        return None, "past"
+    return event_date, None
+
+
+def _check_event_time(text: str):
+    """
+    Parse an HH:MM event time.
+
+    Returns:
+        ((hour, minute), None), or (None, reason) with reason "format" or "invalid"
+    """
+    time_parts = _parse_hhmm(text)
+    if not time_parts:
+        return None, "format"
+
+    hour, minute = time_parts
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        return None, "invalid"
+    return time_parts, None
+
+
+def _validate_date(value: str):
+    """Error message for an invalid or past DD.MM.YYYY date, None if valid."""
+    error = _check_event_date(value)[1]
+    return _EDIT_DATE_ERRORS[error] if error else None
+
+
+def _validate_time(value: str):
+    """Error message for an invalid HH:MM time, None if valid."""
+    error = _check_event_time(value)[1]
+    return _EDIT_TIME_ERRORS[error] if error else None
+
+
+def _no_validation(value: str):
+    """Any value is accepted."""
+    return None
+
+
+# Edited field -> validator returning an error message (None when valid)
+_FIELD_VALIDATORS = {
+    "date": _validate_date,
+    "time": _validate_time,
+    "title": lambda value: None if len(value) >= 3 else
+        "Tadbir nomi juda qisqa. Kamida 3 ta belgidan iborat bo'lishi kerak:",
+    "place": lambda value: None if len(value) >= 2 else "Joy nomi juda qisqa:",
+    "comment": _no_validation,
+}
+
+
 def format_event_text(event: dict, detailed: bool = False) -> str:
     """Format event information as text."""
-    text = (
-        f"<b>{event['title']}</b>\n"
-        f"📅 {event['date']} – {event['time']}\n"
-        f"📍 {event['place']}\n"
-        f"💬 Izoh: {event.get('comment', 'Izoh yo‘q')}"
-    )
+    return (_EVENT_DETAIL_TMPL if detailed else _EVENT_TEXT_TMPL).format_map(EventFields(event))
 
-    if detailed:
-        text += (
-            f"\n\n👤 Mas'ul: {event['creator_name']}\n"
-            f"🏢 Bo'lim: {event['creator_department']}\n"
-            f"📱 Telefon: {event['creator_phone']}"
-        )
 
-    return text
+def format_events_list(header: str, events: list) -> str:
+    """Format a header followed by every event, each ending with a blank line."""
+    return header + "".join([format_event_text(event) + "\n\n" for event in events])
 
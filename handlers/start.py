@@ -13,7 +13,7 @@ router = Router()
 
 
 @router.message(CommandStart())
-async def cmd_start(message: Message, state: FSMContext):
+async def cmd_start(message: Message, state: FSMContext, user_ctx: dict):
     """Handle /start command with allowed users check."""
     user_id = message.from_user.id
 
@@ -23,14 +23,13 @@ async def cmd_start(message: Message, state: FSMContext):
         return
 
     # Check if user is already registered
-    if await db.is_user_registered(user_id):
+    if user_ctx['is_registered']:
         user = await db.get_user(user_id)
-        is_admin = await db.is_admin(user_id)
 
         await message.answer(
             f"Xush kelibsiz, {user['full_name']}! 👋\n\n"
             f"Quyidagi menyudan kerakli bo'limni tanlang:",
-            reply_markup=kb.get_main_menu_keyboard(is_admin)
+            reply_markup=kb.get_main_menu_keyboard(user_ctx['is_admin'])
         )
     else:
         # Start registration process
@@ -85,7 +84,7 @@ async def process_department(message: Message, state: FSMContext):
 
 
 @router.message(RegistrationStates.waiting_for_phone, F.contact)
-async def process_phone_contact(message: Message, state: FSMContext):
+async def process_phone_contact(message: Message, state: FSMContext, user_ctx: dict):
     """Process phone number from contact sharing."""
     # Verify that the contact belongs to the sender (not someone else's contact)
     if message.contact.user_id != message.from_user.id:
@@ -99,7 +98,7 @@ async def process_phone_contact(message: Message, state: FSMContext):
     phone = message.contact.phone_number
 
     # Complete registration
-    await complete_registration(message, state, phone)
+    await complete_registration(message, state, phone, user_ctx)
 
 
 @router.message(RegistrationStates.waiting_for_phone)
@@ -112,7 +111,7 @@ async def process_phone_text(message: Message, state: FSMContext):
     )
 
 
-async def complete_registration(message: Message, state: FSMContext, phone: str):
+async def complete_registration(message: Message, state: FSMContext, phone: str, user_ctx: dict):
     """Complete the registration process."""
     # Get data from state
     data = await state.get_data()
@@ -124,15 +123,13 @@ async def complete_registration(message: Message, state: FSMContext, phone: str)
     success = await db.add_user(user_id, full_name, department, phone)
 
     if success:
-        is_admin = await db.is_admin(user_id)
-
         await message.answer(
             "✅ Ro'yxatdan o'tish muvaffaqiyatli yakunlandi!\n\n"
             f"Ism: {full_name}\n"
             f"Bo'lim: {department}\n"
             f"Telefon: {phone}\n\n"
             "Endi quyidagi menyudan kerakli bo'limni tanlashingiz mumkin:",
-            reply_markup=kb.get_main_menu_keyboard(is_admin)
+            reply_markup=kb.get_main_menu_keyboard(user_ctx['is_admin'])
         )
     else:
         await message.answer(
@@ -145,14 +142,11 @@ async def complete_registration(message: Message, state: FSMContext, phone: str)
 
 
 @router.message(F.text == "🔙 Asosiy menyu")
-async def back_to_main_menu(message: Message, state: FSMContext):
+async def back_to_main_menu(message: Message, state: FSMContext, user_ctx: dict):
     """Return to main menu."""
     await state.clear()
 
-    user_id = message.from_user.id
-    is_admin = await db.is_admin(user_id)
-
     await message.answer(
         "Asosiy menyu:",
-        reply_markup=kb.get_main_menu_keyboard(is_admin)
+        reply_markup=kb.get_main_menu_keyboard(user_ctx['is_admin'])
     )
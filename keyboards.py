@@ -1,10 +1,18 @@
 """Keyboard layouts for the Event Organizer Bot."""
-from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.types import ReplyKeyboardMarkup, ReplyKeyboardRemove, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import ReplyKeyboardBuilder, InlineKeyboardBuilder
-from typing import List, Optional, Dict
+from functools import lru_cache
+from typing import List, Optional, Dict, Tuple
 import config
 
+# Keyboards that don't depend on data are built once and shared; aiogram only
+# serializes them when sending, so reusing one instance is safe
 
+# Events per page of the "my events" keyboard
+MY_EVENTS_PAGE_SIZE = 20
+
+
+@lru_cache(maxsize=None)
 def get_phone_keyboard() -> ReplyKeyboardMarkup:
     """Get keyboard with phone number sharing button."""
     keyboard = ReplyKeyboardBuilder()
@@ -14,14 +22,20 @@ def get_phone_keyboard() -> ReplyKeyboardMarkup:
 
 def get_departments_keyboard(departments: List[str] = None) -> ReplyKeyboardMarkup:
     """Get keyboard with department buttons."""
+    return _build_departments_keyboard(tuple(departments if departments else config.DEPARTMENTS))
+
+
+# Keyed by the names themselves, so a changed department list builds a new keyboard
+@lru_cache(maxsize=8)
+def _build_departments_keyboard(dept_names: Tuple[str, ...]) -> ReplyKeyboardMarkup:
     keyboard = ReplyKeyboardBuilder()
-    dept_list = departments if departments else config.DEPARTMENTS
-    for department in dept_list:
+    for department in dept_names:
         keyboard.button(text=department)
     keyboard.adjust(2)  # 2 buttons per row
     return keyboard.as_markup(resize_keyboard=True, one_time_keyboard=True)
 
 
+@lru_cache(maxsize=None)
 def get_main_menu_keyboard(is_admin: bool = False) -> ReplyKeyboardMarkup:
     """Get main menu keyboard."""
     keyboard = ReplyKeyboardBuilder()
@@ -37,6 +51,7 @@ def get_main_menu_keyboard(is_admin: bool = False) -> ReplyKeyboardMarkup:
     return keyboard.as_markup(resize_keyboard=True)
 
 
+@lru_cache(maxsize=None)
 def get_events_schedule_reply_keyboard() -> ReplyKeyboardMarkup:
     """Get reply keyboard for events schedule options."""
     keyboard = ReplyKeyboardBuilder()
@@ -48,6 +63,7 @@ def get_events_schedule_reply_keyboard() -> ReplyKeyboardMarkup:
     return keyboard.as_markup(resize_keyboard=True)
 
 
+@lru_cache(maxsize=None)
 def get_confirmation_keyboard() -> InlineKeyboardMarkup:
     """Get confirmation keyboard."""
     keyboard = InlineKeyboardBuilder()
@@ -57,19 +73,30 @@ def get_confirmation_keyboard() -> InlineKeyboardMarkup:
     return keyboard.as_markup()
 
 
+@lru_cache(maxsize=None)
+def _get_back_to_events_keyboard() -> InlineKeyboardMarkup:
+    """Event actions for non-creators: only the back button."""
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="🔙 Orqaga", callback_data="back_to_events")]
+    ])
+
+
 def get_event_actions_keyboard(event_id: int, is_creator: bool = True) -> InlineKeyboardMarkup:
     """Get keyboard with event actions."""
-    keyboard = InlineKeyboardBuilder()
-
-    if is_creator:
-        keyboard.button(text="✏️ Tahrirlash", callback_data=f"edit_event_{event_id}")
-        keyboard.button(text="❌ Bekor qilish", callback_data=f"cancel_event_{event_id}")
+    if not is_creator:
+        return _get_back_to_events_keyboard()
 
-    keyboard.button(text="🔙 Orqaga", callback_data="back_to_events")
-    keyboard.adjust(2 if is_creator else 1)
-    return keyboard.as_markup()
+    # Built directly: only the callback data varies between events
+    return InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(text="✏️ Tahrirlash", callback_data=f"edit_event_{event_id}"),
+            InlineKeyboardButton(text="❌ Bekor qilish", callback_data=f"cancel_event_{event_id}"),
+        ],
+        [InlineKeyboardButton(text="🔙 Orqaga", callback_data="back_to_events")],
+    ])
 
 
+@lru_cache(maxsize=None)
 def get_edit_event_fields_keyboard() -> InlineKeyboardMarkup:
     """Get keyboard for selecting field to edit."""
     keyboard = InlineKeyboardBuilder()
@@ -83,19 +110,32 @@ def get_edit_event_fields_keyboard() -> InlineKeyboardMarkup:
     return keyboard.as_markup()
 
 
-def get_my_events_keyboard(events: List[dict]) -> InlineKeyboardMarkup:
-    """Get keyboard with user's events."""
-    keyboard = InlineKeyboardBuilder()
+def get_my_events_keyboard(events: List[dict], page: int = 0) -> InlineKeyboardMarkup:
+    """Get keyboard with one page of user's events (out-of-range pages show the last one)."""
+    page = max(0, min(page, (len(events) - 1) // MY_EVENTS_PAGE_SIZE))
+    start = page * MY_EVENTS_PAGE_SIZE
 
-    for event in events:
-        button_text = f"{event['date']} - {event['title'][:30]}"
-        keyboard.button(text=button_text, callback_data=f"view_event_{event['id']}")
+    # Built directly, one row per event: this keyboard differs on every call
+    rows = [
+        [InlineKeyboardButton(text=f"{event['date']} - {event['title'][:30]}",
+                              callback_data=f"view_event_{event['id']}")]
+        for event in events[start:start + MY_EVENTS_PAGE_SIZE]
+    ]
 
-    keyboard.button(text="🔙 Orqaga", callback_data="back_to_menu")
-    keyboard.adjust(1)
-    return keyboard.as_markup()
+    # Previous/next page buttons share one row
+    nav_row = []
+    if page > 0:
+        nav_row.append(InlineKeyboardButton(text="⬅️ Oldingi", callback_data=f"my_events_page_{page - 1}"))
+    if start + MY_EVENTS_PAGE_SIZE < len(events):
+        nav_row.append(InlineKeyboardButton(text="Keyingi ➡️", callback_data=f"my_events_page_{page + 1}"))
+    if nav_row:
+        rows.append(nav_row)
+
+    rows.append([InlineKeyboardButton(text="🔙 Orqaga", callback_data="back_to_menu")])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
+@lru_cache(maxsize=None)
 def get_cancel_keyboard() -> ReplyKeyboardMarkup:
     """Get keyboard with cancel button."""
     keyboard = ReplyKeyboardBuilder()
@@ -103,6 +143,7 @@ def get_cancel_keyboard() -> ReplyKeyboardMarkup:
     return keyboard.as_markup(resize_keyboard=True)
 
 
+@lru_cache(maxsize=None)
 def get_skip_keyboard() -> ReplyKeyboardMarkup:
     """Get keyboard with skip button for optional fields."""
     keyboard = ReplyKeyboardBuilder()
@@ -114,10 +155,10 @@ def get_skip_keyboard() -> ReplyKeyboardMarkup:
 
 def remove_keyboard() -> ReplyKeyboardMarkup:
     """Remove keyboard."""
-    from aiogram.types import ReplyKeyboardRemove
     return ReplyKeyboardRemove()
 
 
+@lru_cache(maxsize=None)
 def get_departments_management_keyboard() -> InlineKeyboardMarkup:
     """Get keyboard for departments management."""
     keyboard = InlineKeyboardBuilder()
@@ -130,10 +171,17 @@ def get_departments_management_keyboard() -> InlineKeyboardMarkup:
 
 def get_departments_list_keyboard(departments: List[Dict] = None) -> InlineKeyboardMarkup:
     """Get keyboard for department list with delete buttons."""
+    return _build_departments_list_keyboard(
+        tuple((dept['id'], dept['name']) for dept in departments or ())
+    )
+
+
+# Keyed by (id, name) pairs, so adding or deleting a department builds a new keyboard
+@lru_cache(maxsize=8)
+def _build_departments_list_keyboard(depts: Tuple[Tuple[int, str], ...]) -> InlineKeyboardMarkup:
     keyboard = InlineKeyboardBuilder()
-    if departments:
-        for dept in departments:
-            keyboard.button(text=f"❌ {dept['name']}", callback_data=f"dept_delete:{dept['id']}")
+    for dept_id, name in depts:
+        keyboard.button(text=f"❌ {name}", callback_data=f"dept_delete:{dept_id}")
     keyboard.button(text="🔙 Orqaga", callback_data="dept_manage")
     keyboard.adjust(1)
     return keyboard.as_markup()
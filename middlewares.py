@@ -0,0 +1,28 @@
+"""Middlewares for the Event Organizer Bot."""
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from database import db
+
+
+class UserContextMiddleware(BaseMiddleware):
+    """
+    Resolve the sender's admin and registration status once per update.
+
+    Filters and handlers receive it as ``user_ctx``
+    ({'is_admin': bool, 'is_registered': bool}) instead of querying the
+    database themselves.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        user = data.get('event_from_user')
+        if user is not None:
+            data['user_ctx'] = await db.get_user_context(user.id)
+        return await handler(event, data)
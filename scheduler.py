@@ -1,11 +1,15 @@
 """Scheduler module for event reminders."""
 import asyncio
 import logging
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, Optional, Set, Tuple
+from aiogram.exceptions import TelegramRetryAfter
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
 import pytz
 import config
 from database import db
@@ -13,6 +17,72 @@ from google_sheets import sheets_manager
 
 logger = logging.getLogger(__name__)
 
+# Local timezone, resolved once
+_TZ = pytz.timezone(config.TIMEZONE)
+
+# Event details shared by the new event notification and the reminders
+_EVENT_BODY_TMPL = (
+    "<b>{title}</b>\n\n"
+    "📅 Sana: {date}\n"
+    "🕐 Vaqt: {time}\n"
+    "📍 Joy: {place}\n"
+    "💬 Izoh: {comment}\n\n"
+    "👤 Mas'ul: {creator_name}\n"
+    "🏢 Bo'lim: {creator_department}\n"
+    "📱 Telefon: {creator_phone}"
+)
+_REMINDER_TMPL = "🔔 <b>Tadbir eslatmasi!</b>\n\n" + _EVENT_BODY_TMPL + "\n\n⏰ <b>{time_desc}</b> qoldi!"
+_NEW_EVENT_TMPL = "📢 <b>Yangi tadbir qo'shildi!</b>\n\n" + _EVENT_BODY_TMPL
+
+
+class EventFields(dict):
+    """
+    Event values for str.format_map with event templates.
+
+    A missing comment gets the default text; handlers use it for their
+    templates too.
+    """
+
+    def __missing__(self, key):
+        if key == 'comment':
+            return 'Izoh yoʼq'
+        raise KeyError(key)
+
+
+# Reminders due up to this long ago are still sent (e.g. after a restart)
+REMINDER_CATCH_UP = timedelta(hours=1)
+
+# Telegram accepts about 20 messages per minute into one group
+GROUP_SEND_LIMIT = 20
+GROUP_SEND_WINDOW = 60  # seconds
+
+
+def _reminder_type(hours_before: float) -> str:
+    """Identifier stored in the reminders table for a REMINDER_HOURS entry."""
+    # For hours >= 1: use hours, for minutes use 'min' suffix
+    if hours_before >= 1:
+        return f"{hours_before}h_before"
+    # Convert to minutes for sub-hour reminders
+    minutes = int(hours_before * 60)
+    return f"{minutes}min_before"
+
+
+def _reminder_job_id(event_id: int, hours_before: float) -> str:
+    """APScheduler job id of one reminder of an event."""
+    return f"reminder_{event_id}_{_reminder_type(hours_before)}"
+
+
+# An event's date and time are parsed when its jobs are added and again when
+# each reminder is due, so results are kept per (date, time) pair
+@lru_cache(maxsize=4096)
+def _parse_event_datetime(date_str: str, time_str: str) -> Optional[datetime]:
+    """Parse event date and time into a timezone-aware datetime object."""
+    try:
+        return _TZ.localize(datetime.strptime(f"{date_str} {time_str}", "%d.%m.%Y %H:%M"))
+    except ValueError as e:
+        logger.debug("Error parsing datetime '%s %s': %s", date_str, time_str, e)
+        return None
+
 
 class ReminderScheduler:
     """Scheduler for sending event reminders."""
@@ -20,21 +90,77 @@ class ReminderScheduler:
     def __init__(self, bot):
         """Initialize the scheduler."""
         self.bot = bot
-        self.scheduler = AsyncIOScheduler(timezone=pytz.timezone(config.TIMEZONE))
+        self.scheduler = AsyncIOScheduler(timezone=_TZ)
         self.running = False
+        # (event_id, reminder_type) pairs already sent, as in the reminders table
+        self._sent: Set[Tuple[int, str]] = set()
+        # Events with pending reminder jobs, kept current by schedule_event and
+        # unschedule_event so due reminders don't read them back from the database
+        self._events: Dict[int, dict] = {}
+        # Messages waiting for send_to_group's rate-limited sender (started on first use)
+        self._send_queue: Optional[asyncio.Queue] = None
+        self._sender_task: Optional[asyncio.Task] = None
 
-    def start(self):
-        """Start the scheduler with two jobs: check reminders and mark past events."""
-        if not self.running:
-            # Job 1: Check reminders every 1 minute
+    async def load_reminders(self):
+        """Schedule reminders of all upcoming events (call once before start())."""
+        self._sent = await db.get_sent_reminders()
+        now = datetime.now(_TZ)
+        for event in await db.get_upcoming_events():
+            self._schedule_event_reminders(event, now)
+        logger.info("Scheduled %d pending reminders", len(self.scheduler.get_jobs()))
+
+    def schedule_event(self, event: dict, edited: bool = False):
+        """
+        Schedule reminders for a new or edited event.
+
+        Editing replaces the event's reminder jobs and clears its sent
+        reminders (as db.update_event does), so they are sent again for the
+        new date and time.
+        """
+        if edited:
+            self.unschedule_event(event['id'])
+            self._sent = {sent for sent in self._sent if sent[0] != event['id']}
+        self._schedule_event_reminders(event, datetime.now(_TZ))
+
+    def unschedule_event(self, event_id: int):
+        """Drop the pending reminder jobs of an edited or cancelled event."""
+        self._events.pop(event_id, None)
+        for hours_before in config.REMINDER_HOURS:
+            try:
+                self.scheduler.remove_job(_reminder_job_id(event_id, hours_before))
+            except JobLookupError:
+                pass
+
+    def _schedule_event_reminders(self, event: dict, now: datetime):
+        """Add a one-off job for each of the event's reminders not past the catch-up window."""
+        event_datetime = _parse_event_datetime(event['date'], event['time'])
+        if not event_datetime:
+            logger.warning("Could not parse datetime for event %s", event.get('id', 'unknown'))
+            return
+
+        # Skip past events
+        if now >= event_datetime:
+            return
+
+        for hours_before in config.REMINDER_HOURS:
+            reminder_time = event_datetime - timedelta(hours=hours_before)
+            if reminder_time <= now - REMINDER_CATCH_UP:
+                continue
+            self._events[event['id']] = event
+            # Reminders inside the catch-up window run right away
             self.scheduler.add_job(
-                self.check_reminders,
-                trigger=IntervalTrigger(minutes=1),
-                id='check_reminders',
-                replace_existing=True
+                self._send_due_reminder,
+                trigger=DateTrigger(run_date=max(reminder_time, now)),
+                args=[event['id'], hours_before, reminder_time],
+                id=_reminder_job_id(event['id'], hours_before),
+                replace_existing=True,
+                misfire_grace_time=int(REMINDER_CATCH_UP.total_seconds())
             )
 
-            # Job 2: Mark past events every hour at minute 5
+    def start(self):
+        """Start the scheduler: queued reminder jobs plus the mark past events job."""
+        if not self.running:
+            # Mark past events every hour at minute 5
             self.scheduler.add_job(
                 self.mark_past_events_job,
                 trigger=CronTrigger(minute=5),
@@ -50,74 +176,103 @@ class ReminderScheduler:
         """Stop the scheduler."""
         if self.running:
             self.scheduler.shutdown()
+            if self._sender_task is not None:
+                self._sender_task.cancel()
             self.running = False
             logger.info("Reminder scheduler stopped")
 
-    async def check_reminders(self):
-        """Check upcoming events and send reminders if necessary."""
-        try:
-            tz = pytz.timezone(config.TIMEZONE)
-            now = datetime.now(tz)
-            events = await db.get_upcoming_events()
+    async def send_to_group(self, text: str):
+        """
+        Send an HTML message to the media group through the rate-limited queue.
 
-            for event in events:
-                await self._check_event_reminders(event, now)
+        Returns once the message is sent and raises what sending raised.
+        """
+        if self._send_queue is None:
+            self._send_queue = asyncio.Queue()
+            self._sender_task = asyncio.create_task(self._sender_loop())
+        sent = asyncio.get_running_loop().create_future()
+        self._send_queue.put_nowait((text, sent))
+        await sent
 
-        except Exception as e:
-            logger.error(f"Error checking reminders: {e}", exc_info=True)
+    async def _sender_loop(self):
+        """Send queued messages in order, at most GROUP_SEND_LIMIT per GROUP_SEND_WINDOW."""
+        loop = asyncio.get_running_loop()
+        send_times = deque(maxlen=GROUP_SEND_LIMIT)
+        while True:
+            text, sent = await self._send_queue.get()
+            if len(send_times) == GROUP_SEND_LIMIT:
+                wait = send_times[0] + GROUP_SEND_WINDOW - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
 
-    async def _check_event_reminders(self, event: dict, now: datetime):
-        """Check and send reminders for a specific event."""
+            while True:
+                try:
+                    await self.bot.send_message(
+                        chat_id=config.MEDIA_GROUP_CHAT_ID,
+                        text=text,
+                        parse_mode="HTML"
+                    )
+                except TelegramRetryAfter as e:
+                    # Flood control: wait as long as Telegram asks, then retry
+                    logger.warning("Telegram flood control, retrying in %ss", e.retry_after)
+                    await asyncio.sleep(e.retry_after)
+                    continue
+                except Exception as e:
+                    if not sent.done():
+                        sent.set_exception(e)
+                else:
+                    if not sent.done():
+                        sent.set_result(None)
+                break
+            send_times.append(loop.time())
+
+    async def _send_due_reminder(self, event_id: int, hours_before: float, reminder_time: datetime):
+        """Reminder job: send the reminder unless it is stale or already sent."""
         try:
-            event_datetime = self._parse_event_datetime(event['date'], event['time'])
-            if not event_datetime:
-                logger.warning(f"Could not parse datetime for event {event.get('id', 'unknown')}")
-                return
+            now = datetime.now(_TZ)
 
-            # Skip past events
-            if now >= event_datetime:
+            # Missed by more than the catch-up window (e.g. the bot was down)
+            if reminder_time <= now - REMINDER_CATCH_UP:
                 return
 
-            for hours_before in config.REMINDER_HOURS:
-                reminder_time = event_datetime - timedelta(hours=hours_before)
-
-                # Create reminder_type identifier based on time unit
-                # For hours >= 1: use hours, for minutes use 'min' suffix
-                if hours_before >= 1:
-                    reminder_type = f"{hours_before}h_before"
-                else:
-                    # Convert to minutes for sub-hour reminders
-                    minutes = int(hours_before * 60)
-                    reminder_type = f"{minutes}min_before"
-
-                time_diff = (reminder_time - now).total_seconds()
-
-                # Send reminder if within next 60 seconds or already passed but not sent
-                if 0 <= time_diff < 60 or (-3600 < time_diff < 0):  # 1 hour catch-up window
-                    already_sent = await db.is_reminder_sent(event['id'], reminder_type)
-                    if not already_sent:
-                        await self._send_reminder(event, hours_before)
-                        await db.add_reminder(event['id'], reminder_type)
+            reminder_type = _reminder_type(hours_before)
+            if (event_id, reminder_type) in self._sent:
+                return
 
-        except Exception as e:
-            logger.error(f"Error in _check_event_reminders: {e}", exc_info=True)
+            # Cancelled events were unscheduled and dropped from _events
+            event = self._events.get(event_id)
+            if not event:
+                return
 
-    def _parse_event_datetime(self, date_str: str, time_str: str) -> Optional[datetime]:
-        """Parse event date and time into a timezone-aware datetime object."""
-        try:
-            day, month, year = map(int, date_str.split('.'))
-            hour, minute = map(int, time_str.split(':'))
+            # The event moved since the job was added, or it has already started
+            event_datetime = _parse_event_datetime(event['date'], event['time'])
+            if (not event_datetime or now >= event_datetime
+                    or event_datetime - timedelta(hours=hours_before) != reminder_time):
+                return
 
-            tz = pytz.timezone(config.TIMEZONE)
-            dt = datetime(year, month, day, hour, minute)
-            return tz.localize(dt)
+            # Claiming it first means a reminder is sent at most once; a failed
+            # send gives the claim back so reloading reminders (e.g. after a
+            # restart) can still send it
+            if not await db.try_claim_reminder(event_id, reminder_type):
+                return
+            self._sent.add((event_id, reminder_type))
+            try:
+                await self._send_reminder(event, hours_before)
+            except Exception:
+                self._sent.discard((event_id, reminder_type))
+                await db.release_reminder(event_id, reminder_type)
 
         except Exception as e:
-            logger.debug(f"Error parsing datetime '{date_str} {time_str}': {e}")
-            return None
+            logger.exception("Error in _send_due_reminder: %s", e)
+        finally:
+            # APScheduler removes a date job before running it, so this is the
+            # event's last reminder once none of its jobs are left
+            if not any(self.scheduler.get_job(_reminder_job_id(event_id, hours))
+                       for hours in config.REMINDER_HOURS):
+                self._events.pop(event_id, None)
 
     async def _send_reminder(self, event: dict, hours_before: float):
-        """Send reminder message to media group chat."""
+        """Send reminder message to media group chat; raises if sending failed."""
         try:
             if not config.MEDIA_GROUP_CHAT_ID:
                 logger.warning("MEDIA_GROUP_CHAT_ID not set, skipping reminder")
@@ -137,28 +292,14 @@ class ReminderScheduler:
                 minutes = int(hours_before * 60)
                 time_desc = f"{minutes} daqiqa"
 
-            message = (
-                f"🔔 <b>Tadbir eslatmasi!</b>\n\n"
-                f"<b>{event['title']}</b>\n\n"
-                f"📅 Sana: {event['date']}\n"
-                f"🕐 Vaqt: {event['time']}\n"
-                f"📍 Joy: {event['place']}\n"
-                f"💬 Izoh: {event.get('comment', 'Izoh yoʼq')}\n\n"
-                f"👤 Mas'ul: {event['creator_name']}\n"
-                f"🏢 Bo'lim: {event['creator_department']}\n"
-                f"📱 Telefon: {event['creator_phone']}\n\n"
-                f"⏰ <b>{time_desc}</b> qoldi!"
-            )
+            message = _REMINDER_TMPL.format_map(EventFields(event, time_desc=time_desc))
 
-            await self.bot.send_message(
-                chat_id=config.MEDIA_GROUP_CHAT_ID,
-                text=message,
-                parse_mode="HTML"
-            )
-            logger.info(f"Reminder sent for event '{event['title']}' ({hours_before}h before)")
+            await self.send_to_group(message)
+            logger.info("Reminder sent for event '%s' (%sh before)", event['title'], hours_before)
 
         except Exception as e:
-            logger.error(f"Error sending reminder: {e}", exc_info=True)
+            logger.exception("Error sending reminder: %s", e)
+            raise
 
     async def send_immediate_notification(self, event: dict):
         """Send immediate notification about new event to media group."""
@@ -167,35 +308,23 @@ class ReminderScheduler:
                 logger.warning("MEDIA_GROUP_CHAT_ID not set, skipping notification")
                 return
 
-            message = (
-                f"📢 <b>Yangi tadbir qo'shildi!</b>\n\n"
-                f"<b>{event['title']}</b>\n\n"
-                f"📅 Sana: {event['date']}\n"
-                f"🕐 Vaqt: {event['time']}\n"
-                f"📍 Joy: {event['place']}\n"
-                f"💬 Izoh: {event.get('comment', 'Izoh yoʼq')}\n\n"
-                f"👤 Mas'ul: {event['creator_name']}\n"
-                f"🏢 Bo'lim: {event['creator_department']}\n"
-                f"📱 Telefon: {event['creator_phone']}"
-            )
+            message = _NEW_EVENT_TMPL.format_map(EventFields(event))
 
-            await self.bot.send_message(
-                chat_id=config.MEDIA_GROUP_CHAT_ID,
-                text=message,
-                parse_mode="HTML"
-            )
-            logger.info(f"Notification sent for new event '{event['title']}'")
+            await self.send_to_group(message)
+            logger.info("Notification sent for new event '%s'", event['title'])
 
         except Exception as e:
-            logger.error(f"Error sending immediate notification: {e}", exc_info=True)
+            logger.exception("Error sending immediate notification: %s", e)
 
     async def mark_past_events_job(self):
         """Daily job to mark past events in Google Sheets with gray background."""
         try:
             if sheets_manager.is_connected():
-                sheets_manager.mark_past_events()
+                await sheets_manager.mark_past_events(
+                    await db.get_past_event_ids(), await db.get_event_ids()
+                )
                 logger.info("Past events marked in Google Sheets")
             else:
                 logger.warning("Google Sheets not connected, skipping mark past events")
         except Exception as e:
-            logger.error(f"Error in mark_past_events_job: {e}", exc_info=True)
+            logger.exception("Error in mark_past_events_job: %s", e)
@@ -49,6 +49,7 @@ async def database(temp_db_path, mock_config):
     db = Database(db_path=temp_db_path)
     await db.init_db()
     yield db
+    await db.close()
 
 
 @pytest.fixture
@@ -62,6 +62,31 @@ class TestDatabaseInitialization:
         final_count = len(await database.get_all_departments())
         assert initial_count == final_count
 
+    async def test_queries_share_one_connection(self, database_with_user):
+        """Test queries reuse one connection and failed writes leave no open transaction."""
+        await database_with_user.get_user(11111)
+        conn = database_with_user._conn
+
+        assert await database_with_user.add_user(11111, "Dup", "IT Department", "+998900000000") is False
+        assert database_with_user._conn is conn
+        assert not conn.in_transaction
+
+    async def test_init_db_backfills_event_date(self, database_with_events):
+        """Test databases created without event_date get it added and filled."""
+        import aiosqlite
+
+        async with aiosqlite.connect(database_with_events.db_path) as db:
+            await db.execute('DROP INDEX idx_events_event_date')
+            await db.execute('DROP INDEX idx_events_creator')
+            await db.execute('ALTER TABLE events DROP COLUMN event_date')
+            await db.commit()
+
+        await database_with_events.init_db()
+
+        events = await database_with_events.get_events_by_date_range("20.12.2026", "20.12.2026")
+        assert [e['title'] for e in events] == ["Team Meeting"]
+        assert events[0]['event_date'] == "2026-12-20"
+
 
 class TestTimezoneConversion:
     """Tests for UTC to local timezone conversion."""
@@ -189,6 +214,40 @@ class TestUserOperations:
         result = await database.is_admin(99999)
         assert not result  # Returns None, which is falsy
 
+    async def test_is_admin_database_answer_cached(self, database_with_user):
+        """Test the database answer is reused until the cache entry expires."""
+        import aiosqlite
+
+        assert await database_with_user.is_admin(11111) is False
+
+        async with aiosqlite.connect(database_with_user.db_path) as db:
+            await db.execute('UPDATE users SET is_admin = 1 WHERE telegram_id = 11111')
+            await db.commit()
+
+        # Still served from the cache
+        assert await database_with_user.is_admin(11111) is False
+
+        # Expired entries are re-read from the database
+        database_with_user._admin_cache[11111] = (0, False)
+        assert await database_with_user.is_admin(11111) is True
+
+    async def test_get_user_context(self, database_with_user):
+        """Test admin/registration status is resolved in one call."""
+        assert await database_with_user.get_user_context(11111) == {
+            'is_admin': False, 'is_registered': True
+        }
+        assert await database_with_user.get_user_context(99999) == {
+            'is_admin': False, 'is_registered': False
+        }
+
+    async def test_get_user_context_refreshed_on_registration(self, database):
+        """Test registering a user drops their cached context."""
+        assert (await database.get_user_context(22222))['is_registered'] is False
+
+        await database.add_user(22222, "New User", "IT", "+998901111111")
+
+        assert (await database.get_user_context(22222))['is_registered'] is True
+
 
 class TestEventOperations:
     """Tests for event CRUD operations."""
@@ -235,6 +294,13 @@ class TestEventOperations:
         )
         assert event_id is not None
 
+    async def test_add_event_returning_matches_get_event(self, database_with_user, sample_event_data):
+        """Test the returned event has the same fields as get_event."""
+        event = await database_with_user.add_event_returning(**sample_event_data)
+        assert event is not None
+        assert event == await database_with_user.get_event(event['id'])
+        assert event['creator_name'] == "Test User"
+
     async def test_get_event_existing(self, database_with_events):
         """Test getting an existing event."""
         event = await database_with_events.get_event(1)
@@ -254,6 +320,18 @@ class TestEventOperations:
         event = await database_with_user.get_event(99999)
         assert event is None
 
+    async def test_get_event_cache_dropped_on_write(self, database_with_events):
+        """Test a cached event is refetched after it is updated or cancelled."""
+        event = await database_with_events.get_event(1)
+        event['title'] = "Changed by caller"
+        assert (await database_with_events.get_event(1))['title'] == "Future Conference"
+
+        await database_with_events.update_event(1, title="Renamed Conference")
+        assert (await database_with_events.get_event(1))['title'] == "Renamed Conference"
+
+        await database_with_events.cancel_event(1)
+        assert (await database_with_events.get_event(1))['is_cancelled'] == 1
+
     async def test_get_upcoming_events(self, database_with_events):
         """Test getting upcoming events."""
         events = await database_with_events.get_upcoming_events()
@@ -264,6 +342,13 @@ class TestEventOperations:
         events = await database_with_events.get_upcoming_events(limit=1)
         assert len(events) == 1
 
+    async def test_get_upcoming_events_excludes_past(self, database_with_events):
+        """Test that events which already started are not upcoming."""
+        past_id = await database_with_events.add_event("Past", "01.01.2020", "10:00", "Hall", "", 11111)
+
+        events = await database_with_events.get_upcoming_events()
+        assert past_id not in [e['id'] for e in events]
+
     async def test_get_upcoming_events_excludes_cancelled(self, database_with_events):
         """Test that cancelled events are excluded from upcoming."""
         # Cancel an event
@@ -306,6 +391,14 @@ class TestEventsByUser:
         # All events in fixture are in 2026, so they should be upcoming
         assert len(events) >= 2
 
+    async def test_get_events_by_user_upcoming_excludes_past_sorted(self, database_with_user):
+        """Test past events are filtered out and the rest come in date order."""
+        for title, date in [("Later", "02.01.2099"), ("Past", "01.01.2020"), ("Sooner", "31.12.2098")]:
+            await database_with_user.add_event(title, date, "10:00", "Hall", "", 11111)
+
+        events = await database_with_user.get_events_by_user(11111, upcoming_only=True)
+        assert [e['title'] for e in events] == ["Sooner", "Later"]
+
     async def test_get_events_by_user_no_events(self, database_with_events):
         """Test user with no events."""
         # Add another user
@@ -386,6 +479,20 @@ class TestEventsByDateRange:
         event_ids = [e['id'] for e in events]
         assert 1 not in event_ids
 
+    async def test_get_events_by_date_range_accepts_dates_sorted_chronologically(self, database_with_events):
+        """Test date objects are accepted and results span months in date order."""
+        from datetime import date
+
+        await database_with_events.add_event(
+            title="January Event", date="05.01.2027", time="09:00",
+            place="Room", comment="", created_by_user_id=11111
+        )
+
+        events = await database_with_events.get_events_by_date_range(
+            date(2026, 12, 1), date(2027, 1, 31)
+        )
+        assert [e['date'] for e in events] == ["20.12.2026", "25.12.2026", "05.01.2027"]
+
 
 class TestUpdateEvent:
     """Tests for update_event."""
@@ -456,6 +563,22 @@ class TestUpdateEvent:
         # Reminder should be cleared
         assert await database_with_events.is_reminder_sent(1, "24h") is False
 
+    async def test_update_event_returning(self, database_with_events):
+        """Test the updated event is returned with creator info."""
+        await database_with_events.add_reminder(1, "24h")
+
+        event = await database_with_events.update_event_returning(1, place="New Hall")
+
+        assert event == await database_with_events.get_event(1)
+        assert event['place'] == "New Hall"
+        assert event['creator_department'] == "IT Department"
+        assert await database_with_events.is_reminder_sent(1, "24h") is False
+
+    async def test_update_event_returning_missing_event(self, database_with_events):
+        """Test None is returned for unknown events and invalid fields."""
+        assert await database_with_events.update_event_returning(99999, title="Nope") is None
+        assert await database_with_events.update_event_returning(1, invalid_field="x") is None
+
 
 class TestCancelAndDeleteEvent:
     """Tests for cancel_event and delete_event."""
@@ -493,6 +616,29 @@ class TestCancelAndDeleteEvent:
         # SQLite DELETE doesn't fail for non-existing rows
         assert result is True
 
+    async def test_get_past_event_ids(self, database_with_events):
+        """Test that only events whose start time has passed are returned."""
+        past_id = await database_with_events.add_event(
+            title="Old Meeting", date="05.01.2020", time="09:00",
+            place="Room 1", comment="", created_by_user_id=11111
+        )
+        cancelled_id = await database_with_events.add_event(
+            title="Old Cancelled", date="31.12.2019", time="23:30",
+            place="Room 2", comment="", created_by_user_id=11111
+        )
+        await database_with_events.cancel_event(cancelled_id)
+
+        past_ids = await database_with_events.get_past_event_ids()
+        assert past_ids == {past_id, cancelled_id}
+
+    async def test_get_event_ids(self, database_with_events):
+        """Test that every event ID is returned, cancelled ones included."""
+        event_ids = await database_with_events.get_event_ids()
+        await database_with_events.cancel_event(min(event_ids))
+
+        assert await database_with_events.get_event_ids() == event_ids
+        assert len(event_ids) > 0
+
 
 class TestReminderOperations:
     """Tests for reminder tracking operations."""
@@ -518,6 +664,31 @@ class TestReminderOperations:
         result = await database_with_events.is_reminder_sent(1, "24h")
         assert result is True
 
+    async def test_get_sent_reminders(self, database_with_events):
+        """Test all sent reminders are returned as (event_id, type) pairs."""
+        await database_with_events.add_reminder(1, "24h")
+        await database_with_events.add_reminder(2, "1h")
+
+        assert await database_with_events.get_sent_reminders() == {(1, "24h"), (2, "1h")}
+
+    async def test_try_claim_reminder_only_once(self, database_with_events):
+        """Test a reminder can be claimed once and is then recorded as sent."""
+        assert await database_with_events.try_claim_reminder(1, "24h") is True
+        assert await database_with_events.try_claim_reminder(1, "24h") is False
+        assert await database_with_events.try_claim_reminder(1, "3h") is True
+
+        assert await database_with_events.get_sent_reminders() == {(1, "24h"), (1, "3h")}
+
+    async def test_released_reminder_can_be_claimed_again(self, database_with_events):
+        """Test releasing a claimed reminder lets it be claimed and sent again."""
+        await database_with_events.try_claim_reminder(1, "24h")
+        await database_with_events.try_claim_reminder(1, "3h")
+
+        assert await database_with_events.release_reminder(1, "24h") is True
+
+        assert await database_with_events.get_sent_reminders() == {(1, "3h")}
+        assert await database_with_events.try_claim_reminder(1, "24h") is True
+
     async def test_is_reminder_sent_false(self, database_with_events):
         """Test is_reminder_sent returns False when not sent."""
         result = await database_with_events.is_reminder_sent(1, "24h")
@@ -569,6 +740,16 @@ class TestStatistics:
 
         assert new_count == initial_count - 1
 
+    async def test_statistics_cached_until_event_changes(self, database_with_events, sample_event_data):
+        """Test statistics are reused between calls and refreshed after event writes."""
+        count = await database_with_events.get_total_events_count()
+        assert await database_with_events.get_total_events_count() == count
+        assert 'total' in database_with_events._stats_cache
+
+        await database_with_events.add_event(**sample_event_data)
+
+        assert await database_with_events.get_total_events_count() == count + 1
+
     async def test_get_total_events_count(self, database_with_events):
         """Test getting total events count."""
         count = await database_with_events.get_total_events_count()
@@ -627,6 +808,30 @@ class TestDepartmentOperations:
         result = await database.add_department("Unique Department")
         assert result is False
 
+    async def test_delete_department_returning_name(self, database):
+        """Test deleting by ID returns the name and updates the cached list."""
+        await database.add_department("Returning Dept")
+        departments = await database.get_all_departments()
+        dept_id = next(d['id'] for d in departments if d['name'] == "Returning Dept")
+
+        assert await database.delete_department_returning(dept_id) == "Returning Dept"
+
+        departments = await database.get_all_departments()
+        assert all(d['id'] != dept_id for d in departments)
+        # Still in the table (soft delete)
+        assert (await database.get_department_by_id(dept_id))['is_active'] == 0
+
+    async def test_delete_department_returning_already_inactive(self, database):
+        """Test deleting an already deleted department succeeds again; unknown IDs don't."""
+        await database.add_department("Twice Dept")
+        departments = await database.get_all_departments()
+        dept_id = next(d['id'] for d in departments if d['name'] == "Twice Dept")
+        await database.delete_department_returning(dept_id)
+
+        assert await database.delete_department_returning(dept_id) == "Twice Dept"
+        assert (await database.get_department_by_id(dept_id))['is_active'] == 0
+        assert await database.delete_department_returning(dept_id + 1000) is None
+
     async def test_delete_department_soft_delete(self, database):
         """Test that delete is a soft delete."""
         await database.add_department("To Delete")
@@ -0,0 +1,511 @@
+"""Tests for the Google Sheets manager, against stub worksheets."""
+import pytest
+
+
+class _StubWorksheet:
+    """Worksheet returning fixed values, whatever columns are asked for."""
+
+    row_count = 1000
+
+    def __init__(self, rows, sheet_id=0, title="Tadbirlar"):
+        self.rows = rows
+        self.id = sheet_id
+        self.title = title
+        self.reads = 0
+
+    def get(self, _range):
+        self.reads += 1
+        return [list(row) for row in self.rows]
+
+    def batch_get(self, ranges):
+        value_ranges = []
+        for cell_range in ranges:
+            first, last = (int(cell[1:]) for cell in cell_range.split(':'))
+            value_ranges.append([list(row) for row in self.rows[first - 1:last]])
+        return value_ranges
+
+
+class _StubSpreadsheet:
+    """Spreadsheet recording every batch_update body."""
+
+    def __init__(self):
+        self.batches = []
+
+    def batch_update(self, body):
+        self.batches.append(body)
+
+
+_HEADER = ["ID", "Tadbir nomi", "Sana", "Vaqt"]
+
+
+@pytest.fixture
+def sheets(mock_config):
+    """Manager connected to stub sheets holding two future events."""
+    from google_sheets import GoogleSheetsManager
+
+    manager = GoogleSheetsManager()
+    manager.worksheet = _StubWorksheet([
+        _HEADER,
+        ["1", "A", "01.01.2099", "10:00"],
+        ["2", "B", "01.02.2099", "10:00"],
+    ])
+    manager.past_worksheet = _StubWorksheet([_HEADER], 1, "Otgan tadbirlar")
+    manager.spreadsheet = _StubSpreadsheet()
+    manager._initialized = True
+    return manager
+
+
+def _sent_request_types(manager):
+    return [kind for body in manager.spreadsheet.batches
+            for request in body['requests'] for kind in request]
+
+
+class TestUpdateEvent:
+    """Tests for moving an edited event to its new sorted row."""
+
+    def test_moved_event_deleted_and_inserted_in_one_batch(self, sheets):
+        """Test the old row is deleted and the new one inserted by one batch_update."""
+        event = {'id': 1, 'title': "A", 'date': "01.03.2099", 'time': "10:00"}
+
+        assert sheets._sync_update_event(1, event) is True
+
+        assert len(sheets.spreadsheet.batches) == 1
+        assert _sent_request_types(sheets) == ['deleteDimension', 'insertDimension', 'updateCells']
+
+    def test_failed_re_add_sends_no_delete(self, sheets, monkeypatch):
+        """Test the old row is kept when the event cannot be re-added."""
+        def fail(*args):
+            raise RuntimeError("sheet read failed")
+
+        monkeypatch.setattr(sheets, '_future_insert_position', fail)
+        event = {'id': 1, 'title': "A", 'date': "01.03.2099", 'time': "10:00"}
+
+        assert sheets._sync_update_event(1, event) is False
+
+        assert 'deleteDimension' not in _sent_request_types(sheets)
+        assert sheets._pending == []
+
+
+class TestRowTargeting:
+    """Tests for writes that target existing rows by number."""
+
+    def test_delete_uses_rows_moved_by_hand(self, sheets):
+        """Test a row inserted by hand after the last read doesn't redirect a delete."""
+        sheets._cached_values(sheets.worksheet)
+        sheets.worksheet.rows.insert(1, ["7", "X", "01.12.2098", "10:00"])
+
+        assert sheets._sync_delete_event(1) is True
+
+        request = sheets.spreadsheet.batches[0]['requests'][0]['deleteDimension']
+        assert (request['range']['startIndex'], request['range']['endIndex']) == (2, 3)
+
+    def test_sheet_read_once_per_batch(self, sheets):
+        """Test queued operations share one re-read and one batch_update."""
+        new_event = {'id': 3, 'title': "C", 'date': "01.04.2099", 'time': "10:00"}
+
+        sheets._sync_run_batched([
+            (sheets._sync_add_event, (new_event,)),
+            (sheets._sync_delete_event, (1,)),
+            (sheets._sync_mark_event_cancelled, (2,)),
+        ])
+
+        assert sheets.worksheet.reads == 1
+        assert len(sheets.spreadsheet.batches) == 1
+
+    def test_writes_queued_first_not_sent_early(self, sheets):
+        """Test a delete after a queued add in one batch doesn't split the batch."""
+        sheets._cached_values(sheets.worksheet)
+        event = {'id': 3, 'title': "C", 'date': "15.01.2099", 'time': "10:00"}
+
+        with sheets.batch():
+            sheets._sync_add_event(event)
+            assert sheets._sync_delete_event(1) is True
+
+        assert len(sheets.spreadsheet.batches) == 1
+        assert _sent_request_types(sheets) == ['insertDimension', 'updateCells', 'deleteDimension']
+
+
+class TestBatching:
+    """Tests for grouping queued operations into one batch_update."""
+
+    def test_queued_operations_sent_in_one_batch(self, sheets):
+        """Test operations applied together share a single batch_update."""
+        new_event = {'id': 3, 'title': "C", 'date': "01.04.2099", 'time': "10:00"}
+        moved_event = {'id': 1, 'title': "A", 'date': "01.03.2099", 'time': "10:00"}
+
+        sheets._sync_run_batched([
+            (sheets._sync_update_event, (1, moved_event)),
+            (sheets._sync_add_event, (new_event,)),
+        ])
+
+        assert len(sheets.spreadsheet.batches) == 1
+        assert _sent_request_types(sheets) == [
+            'deleteDimension', 'insertDimension', 'updateCells', 'insertDimension', 'updateCells'
+        ]
+
+    def test_flush_inside_batch_sends_nothing(self, sheets):
+        """Test flush() leaves requests to the outermost batch."""
+        with sheets.batch():
+            sheets._queue_row_color(sheets.worksheet, 2, {'red': 1.0})
+            assert sheets.flush() is True
+            assert sheets.spreadsheet.batches == []
+
+        assert _sent_request_types(sheets) == ['repeatCell']
+
+
+def _request_backgrounds(manager, kind):
+    """Background color of every row written by requests of one kind."""
+    return [row['values'][0].get('userEnteredFormat', {}).get('backgroundColor')
+            for body in manager.spreadsheet.batches for request in body['requests']
+            if kind in request
+            for row in request[kind]['rows']]
+
+
+class TestAddEventsBulk:
+    """Tests for adding several events at once."""
+
+    def test_events_sorted_and_colored_in_one_batch(self, sheets):
+        """Test future events are inserted in order and past ones appended gray."""
+        from google_sheets import _GRAY, _WHITE
+
+        events = [
+            {'id': 5, 'title': "E", 'date': "15.01.2099", 'time': "09:00"},
+            {'id': 6, 'title': "F", 'date': "02.01.2000", 'time': "10:00"},
+            {'id': 7, 'title': "G", 'date': "01.03.2099", 'time': "08:00"},
+            {'id': 8, 'title': "H", 'date': "01.01.2000", 'time': "10:00"},
+        ]
+
+        assert sheets._sync_add_events_bulk(events) is True
+
+        assert len(sheets.spreadsheet.batches) == 1
+        rows = sheets._cached_rows(sheets.worksheet)
+        assert [row[0] for row in rows[1:]] == ["1", "5", "2", "7", "8", "6"]
+        assert _request_backgrounds(sheets, 'updateCells') == [_WHITE, _WHITE]
+        assert _request_backgrounds(sheets, 'appendCells') == [_GRAY, _GRAY]
+
+    def test_failed_add_sends_nothing(self, sheets, monkeypatch):
+        """Test no event is written when one of them cannot be added."""
+        def fail(*args):
+            raise RuntimeError("sheet read failed")
+
+        monkeypatch.setattr(sheets, '_future_insert_position', fail)
+        events = [
+            {'id': 5, 'title': "E", 'date': "01.01.2000", 'time': "10:00"},
+            {'id': 6, 'title': "F", 'date': "15.01.2099", 'time': "09:00"},
+        ]
+
+        assert sheets._sync_add_events_bulk(events) is False
+
+        assert sheets.spreadsheet.batches == []
+
+
+def _appended_ids(manager):
+    """Event IDs appended to the past sheet, in order."""
+    return [row['values'][0]['userEnteredValue']['stringValue']
+            for body in manager.spreadsheet.batches for request in body['requests']
+            if 'appendCells' in request and request['appendCells']['sheetId'] == manager.past_worksheet.id
+            for row in request['appendCells']['rows']]
+
+
+class TestMarkPastEvents:
+    """Tests for moving past events to the "Otgan tadbirlar" sheet."""
+
+    def test_started_event_not_yet_past_in_database_is_retried(self, sheets):
+        """Test a kept row that already started doesn't let the next run be skipped."""
+        from datetime import datetime, timedelta
+        from google_sheets import _LOCAL_TZ
+
+        now = datetime.now(_LOCAL_TZ)
+        later = now + timedelta(days=2)
+        started = ["1", "A", now.strftime('%d.%m.%Y'), now.strftime('%H:%M')]
+        upcoming = ["2", "B", later.strftime('%d.%m.%Y'), later.strftime('%H:%M')]
+        sheets.worksheet.rows = [_HEADER, started, upcoming]
+
+        # The database snapshot predates event 1's start
+        assert sheets._sync_mark_past_events(set(), {1, 2}) is True
+        assert _appended_ids(sheets) == []
+        assert sheets._next_boundary_crossing <= now
+
+        sheets._rows_cache.clear()
+        assert sheets._sync_mark_past_events({1}, {1, 2}) is True
+        assert _appended_ids(sheets) == ["1"]
+
+    def test_rows_of_deleted_events_moved_by_date(self, sheets):
+        """Test numeric IDs the database doesn't know are judged by Sana/Vaqt."""
+        sheets.worksheet.rows.append(["9", "Z", "01.01.2000", "10:00"])
+
+        assert sheets._sync_mark_past_events(set(), {1, 2}) is True
+
+        assert _appended_ids(sheets) == ["9"]
+        assert 'deleteDimension' in _sent_request_types(sheets)
+
+
+class TestPartitionRows:
+    """Tests for splitting main-sheet rows into past and future."""
+
+    def test_database_ids_decide_known_events(self, sheets):
+        """Test known IDs follow the database and other rows their Sana/Vaqt."""
+        from datetime import datetime
+        from google_sheets import _LOCAL_TZ
+
+        rows = [
+            _HEADER,
+            ["1", "A", "01.01.2099", "10:00"],        # past per database
+            ["2", "B", "01.01.2000", "10:00"],        # not past per database
+            ["9", "Deleted", "02.01.2000", "10:00"],  # unknown ID
+            ["", "Manual", "01.01.2001", "10:00"],    # no ID
+            ["", "Note", "soon", ""],                 # unparseable, skipped
+            ["3", "Short"],                           # too short, skipped
+        ]
+
+        past, future = sheets._partition_rows(rows, datetime.now(_LOCAL_TZ), {1}, {1, 2})
+
+        assert [idx for idx, _ in past] == [4, 5, 2]
+        assert [idx for idx, _ in future] == [3]
+
+    def test_dates_decide_without_database_ids(self, sheets):
+        """Test every row is judged by its date when no ID sets are given."""
+        from datetime import datetime
+        from google_sheets import _LOCAL_TZ
+
+        rows = [_HEADER, ["1", "A", "01.01.2099", "10:00"], ["2", "B", "01.01.2000", "10:00"]]
+
+        past, future = sheets._partition_rows(rows, datetime.now(_LOCAL_TZ))
+
+        assert [idx for idx, _ in past] == [3]
+        assert [idx for idx, _ in future] == [2]
+
+
+class TestRowColors:
+    """Tests for recoloring kept rows in contiguous blocks."""
+
+    def test_row_runs(self):
+        """Test row numbers are grouped into sorted contiguous runs."""
+        from google_sheets import _row_runs
+
+        assert _row_runs([9, 3, 2, 4, 7, 3]) == [(2, 4), (7, 7), (9, 9)]
+        assert _row_runs([]) == []
+
+    def test_one_repeat_cell_per_same_color_block(self, sheets):
+        """Test kept rows are recolored with one repeatCell per run of one color."""
+        from google_sheets import _RED, _WHITE
+
+        sheets.worksheet.rows = [
+            _HEADER,
+            ["1", "A", "01.01.2099", "10:00"],
+            ["2", "B", "02.01.2099", "10:00"],
+            ["3", "[BEKOR QILINDI] C", "03.01.2099", "10:00"],
+            ["4", "[BEKOR QILINDI] D", "04.01.2099", "10:00"],
+            ["5", "E", "05.01.2099", "10:00"],
+        ]
+
+        assert sheets._sync_mark_past_events() is True
+
+        colors = [(request['repeatCell']['range']['startRowIndex'],
+                   request['repeatCell']['range']['endRowIndex'],
+                   request['repeatCell']['cell']['userEnteredFormat']['backgroundColor'])
+                  for body in sheets.spreadsheet.batches for request in body['requests']
+                  if 'repeatCell' in request]
+        assert colors == [(1, 3, _WHITE), (5, 6, _WHITE), (3, 5, _RED)]
+
+
+class TestRowIndex:
+    """Tests for the ID and datetime indexes kept in step with queued writes."""
+
+    def test_insert_shifts_rows_below(self, sheets):
+        """Test an inserted row is indexed and the rows below it move down."""
+        sheets._cached_values(sheets.worksheet)
+
+        sheets._queue_insert_row(sheets.worksheet, 2, ["3", "C", "01.12.2098", "10:00"])
+
+        assert sheets._id_to_row == {"3": 2, "1": 3, "2": 4}
+        assert sheets._future_row_nums == [2, 3, 4]
+
+    def test_delete_shifts_rows_below(self, sheets):
+        """Test deleted rows leave the index and the rows below them move up."""
+        sheets.worksheet.rows.append(["3", "C", "01.03.2099", "10:00"])
+        sheets._cached_values(sheets.worksheet)
+
+        sheets._queue_rows_delete([2, 3])
+
+        assert sheets._id_to_row == {"3": 2}
+        assert sheets._future_row_nums == [2]
+
+    def test_index_matches_sheet_after_writes(self, sheets):
+        """Test the patched index equals one rebuilt from the patched rows."""
+        sheets._cached_values(sheets.worksheet)
+        event = {'id': 3, 'title': "C", 'date': "15.01.2099", 'time': "10:00"}
+
+        with sheets.batch():
+            sheets._sync_add_event(event)
+            sheets._sync_delete_event(1)
+
+        id_to_row, row_nums = dict(sheets._id_to_row), list(sheets._future_row_nums)
+        sheets._build_row_index(sheets._cached_rows(sheets.worksheet))
+        assert (id_to_row, row_nums) == (sheets._id_to_row, sheets._future_row_nums)
+        assert id_to_row == {"3": 2, "2": 3}
+
+
+class _FakeClock:
+    """Stands in for time.monotonic/time.sleep; sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake clock patched into the google_sheets module's time functions."""
+    import google_sheets
+
+    fake = _FakeClock()
+    monkeypatch.setattr(google_sheets.time, 'monotonic', fake.monotonic)
+    monkeypatch.setattr(google_sheets.time, 'sleep', fake.sleep)
+    return fake
+
+
+class TestRateLimiter:
+    """Tests for pacing Sheets writes."""
+
+    def test_waits_once_window_is_full(self, mock_config, clock):
+        """Test the call over the limit waits until the oldest one leaves the window."""
+        from google_sheets import _RateLimiter
+
+        limiter = _RateLimiter(2, 60)
+        limiter.acquire()
+        clock.now = 10
+        limiter.acquire()
+        clock.now = 20
+        limiter.acquire()
+
+        assert clock.sleeps == [40]
+
+    def test_calls_outside_window_are_forgotten(self, mock_config, clock):
+        """Test calls older than the window don't count toward the limit."""
+        from google_sheets import _RateLimiter
+
+        limiter = _RateLimiter(2, 60)
+        limiter.acquire()
+        limiter.acquire()
+        clock.now = 60
+        limiter.acquire()
+        limiter.acquire()
+
+        assert clock.sleeps == []
+
+
+def _api_error(code, headers=None):
+    """gspread APIError for a response with the given status and headers."""
+    import gspread
+    from types import SimpleNamespace
+
+    error = {'code': code, 'message': "error", 'status': "ERROR"}
+    response = SimpleNamespace(json=lambda: {'error': error}, headers=headers or {})
+    return gspread.exceptions.APIError(response)
+
+
+class TestWithBackoff:
+    """Tests for retrying Sheets API calls."""
+
+    @staticmethod
+    def _failing(*errors):
+        """Call raising the given errors in turn, then returning "ok"."""
+        from google_sheets import _with_backoff
+
+        errors = list(errors)
+        calls = []
+
+        @_with_backoff
+        def call():
+            calls.append(1)
+            if errors:
+                raise errors.pop(0)
+            return "ok"
+        return call, calls
+
+    def test_retries_with_retry_after(self, mock_config, clock):
+        """Test a 429 with Retry-After is retried after that many seconds."""
+        call, calls = self._failing(_api_error(429, {'Retry-After': '7'}))
+
+        assert call() == "ok"
+
+        assert len(calls) == 2
+        assert clock.sleeps == [7]
+
+    def test_backs_off_exponentially(self, mock_config, clock, monkeypatch):
+        """Test server errors without Retry-After wait 1s, 2s, 4s ... plus jitter."""
+        import google_sheets
+
+        monkeypatch.setattr(google_sheets.random, 'uniform', lambda a, b: 0)
+        call, calls = self._failing(_api_error(503), _api_error(500), _api_error(503))
+
+        assert call() == "ok"
+
+        assert clock.sleeps == [1, 2, 4]
+
+    def test_other_errors_raised_at_once(self, mock_config, clock):
+        """Test errors that aren't quota/server errors are not retried."""
+        import gspread
+
+        call, calls = self._failing(_api_error(400))
+
+        with pytest.raises(gspread.exceptions.APIError):
+            call()
+
+        assert len(calls) == 1
+        assert clock.sleeps == []
+
+    def test_gives_up_after_deadline(self, mock_config, clock):
+        """Test retrying stops once the next attempt would start past the deadline."""
+        import gspread
+
+        call, calls = self._failing(*[_api_error(429, {'Retry-After': '30'})] * 5)
+
+        with pytest.raises(gspread.exceptions.APIError):
+            call()
+
+        assert clock.sleeps == [30, 30]
+
+
+class TestStartInitialize:
+    """Tests for connecting in the background."""
+
+    async def test_calls_during_startup_applied_in_one_batch(self, sheets, monkeypatch):
+        """Test operations requested while connecting are deferred, then batched."""
+        sheets._initialized = False
+
+        def connect():
+            sheets._initialized = True
+        monkeypatch.setattr(sheets, '_sync_initialize', connect)
+
+        task = sheets.start_initialize()
+        event = {'id': 3, 'title': "C", 'date': "01.04.2099", 'time': "10:00"}
+        assert await sheets.add_event(event) is True
+        assert await sheets.delete_event(1) is True
+        assert sheets.spreadsheet.batches == []
+
+        await task
+
+        assert len(sheets.spreadsheet.batches) == 1
+        assert _sent_request_types(sheets) == ['insertDimension', 'updateCells', 'deleteDimension']
+        assert sheets._deferred == []
+
+    async def test_deferred_calls_dropped_when_connection_fails(self, sheets, monkeypatch):
+        """Test nothing is sent when the background connection fails."""
+        sheets._initialized = False
+        monkeypatch.setattr(sheets, '_sync_initialize', lambda: None)
+
+        task = sheets.start_initialize()
+        await sheets.delete_event(1)
+        await task
+
+        assert sheets.spreadsheet.batches == []
+        assert sheets._initializing is False